@@ -39,9 +39,14 @@ class ForecastAccuracyTracker:
         return {'days': {}}
     
     def _save(self):
+        # Serialise up front and write once to a temp file, then rename, so
+        # the dashboard never reads a half-written history
         try:
-            with open(self.filepath, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            payload = json.dumps(self.data, indent=2)
+            temp_file = self.filepath + '.tmp'
+            with open(temp_file, 'w') as f:
+                f.write(payload)
+            os.replace(temp_file, self.filepath)
         except IOError as e:
             print(f"[ACCURACY] Warning: Could not save: {e}")
     
@@ -195,19 +200,20 @@ def generate_accuracy_html_parts(accuracy_data: Dict) -> Dict:
             <div class="stat-detail">Complete pairs</div>
         </div>"""
     
-    rows = ""
+    ec = lambda v, g, o: 'error-good' if v <= g else ('error-ok' if v <= o else 'error-poor')
+    
+    rows = []
     for i, d in enumerate(dates):
         sp, sa, sm = accuracy_data['solar_predicted'][i], accuracy_data['solar_actual'][i], accuracy_data['solar_mape'][i]
         lp, la, lm = accuracy_data['load_predicted'][i], accuracy_data['load_actual'][i], accuracy_data['load_mape'][i]
         pm = accuracy_data['price_mae'][i]
         
-        ec = lambda v, g, o: 'error-good' if v <= g else ('error-ok' if v <= o else 'error-poor')
-        
-        rows += f"""<tr>
+        rows.append(f"""<tr>
             <td>{d}</td><td>{sp:.1f}</td><td>{sa:.1f}</td><td class="{ec(sm,15,30)}">{sm:.1f}%</td>
             <td>{lp:.1f}</td><td>{la:.1f}</td><td class="{ec(lm,10,25)}">{lm:.1f}%</td>
             <td class="{ec(pm,3,8)}">{pm:.1f}p</td>
-        </tr>"""
+        </tr>""")
+    rows = "".join(rows)
     
     info = f"""
         <strong>Accuracy Summary ({summary.get('days_tracked',0)} days):</strong><br>
@@ -228,25 +234,26 @@ def build_prediction_data(plan_steps: list) -> Dict:
     Extract prediction chart data from plan steps.
     Returns dict with timeLabels, solarValues, socValues, loadValues, importPrices, exportPrices.
     """
-    data = {
-        'timeLabels': [],
-        'solarValues': [],
-        'socValues': [],
-        'loadValues': [],
-        'importPrices': [],
-        'exportPrices': []
-    }
+    time_labels, solar, soc, load, import_prices, export_prices = [], [], [], [], [], []
     
+    # One pass over the steps, filling every series together
     for step in plan_steps:
         t = step.get('time', '')
-        data['timeLabels'].append(t.strftime('%H:%M') if hasattr(t, 'strftime') else str(t))
-        data['solarValues'].append(step.get('solar_kw', step.get('expected_solar', 0)))
-        data['socValues'].append(step.get('soc_end', step.get('expected_soc', 0)))
-        data['loadValues'].append(step.get('load_kw', step.get('expected_consumption', 0)))
-        data['importPrices'].append(step.get('import_price', step.get('price', 0)))
-        data['exportPrices'].append(step.get('export_price', 0))
+        time_labels.append(t.strftime('%H:%M') if hasattr(t, 'strftime') else str(t))
+        solar.append(step.get('solar_kw', step.get('expected_solar', 0)))
+        soc.append(step.get('soc_end', step.get('expected_soc', 0)))
+        load.append(step.get('load_kw', step.get('expected_consumption', 0)))
+        import_prices.append(step.get('import_price', step.get('price', 0)))
+        export_prices.append(step.get('export_price', 0))
     
-    return data
+    return {
+        'timeLabels': time_labels,
+        'solarValues': solar,
+        'socValues': soc,
+        'loadValues': load,
+        'importPrices': import_prices,
+        'exportPrices': export_prices
+    }
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -326,9 +333,8 @@ def generate_settings_html_parts(config: Dict) -> Dict:
         ('export_rate_sensor', 'Export Rate Sensor', ''),
     ]
     
-    sensors = ''
-    for key, label, default in sensor_defs:
-        sensors += text_input(key, label, config.get(key, default))
+    sensors = ''.join(text_input(key, label, config.get(key, default))
+                      for key, label, default in sensor_defs)
     
     info = """
         <strong>About Settings:</strong><br>
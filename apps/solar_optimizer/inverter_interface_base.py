@@ -7,7 +7,7 @@ This allows the planner to be completely agnostic about the specific inverter ha
 
 from abc import ABC, abstractmethod
 from datetime import datetime, time
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 
 
 class InverterInterface(ABC):
@@ -277,6 +277,32 @@ class InverterInterface(ABC):
         except Exception as e:
             self.log(f"Failed to set {entity_id} to {value}: {e}", level="ERROR")
             return False
+    
+    def set_values(self, entity_ids: List[str], value) -> bool:
+        """
+        Set several number entities to the same value in one service call per domain.
+        
+        HA services accept a list of entity_ids, so e.g. zeroing a whole timed
+        slot is one round trip instead of one per register.
+        
+        Args:
+            entity_ids: Entity IDs to set
+            value: Value to set on all of them
+            
+        Returns:
+            bool: True if successful
+        """
+        try:
+            by_domain = {}
+            for entity_id in entity_ids:
+                by_domain.setdefault(entity_id.split('.')[0], []).append(entity_id)
+            
+            for domain, ids in by_domain.items():
+                self.hass.call_service(f"{domain}/set_value", entity_id=ids, value=value)
+            return True
+        except Exception as e:
+            self.log(f"Failed to set {entity_ids} to {value}: {e}", level="ERROR")
+            return False
 
 
 class InverterCommand:
@@ -291,12 +291,13 @@ class SolisInverterInterface(InverterInterface):
     def clear_charge_slots(self) -> bool:
         """Clear charge slot 1 by setting time to 00:00-00:00"""
         try:
-            success = True
-            success &= self.set_value(self.charge_slot1_start_hour, 0)
-            success &= self.set_value(self.charge_slot1_start_minute, 0)
-            success &= self.set_value(self.charge_slot1_end_hour, 0)
-            success &= self.set_value(self.charge_slot1_end_minute, 0)
-            success &= self.set_value(self.charge_slot1_current, 0)
+            success = self.set_values([
+                self.charge_slot1_start_hour,
+                self.charge_slot1_start_minute,
+                self.charge_slot1_end_hour,
+                self.charge_slot1_end_minute,
+                self.charge_slot1_current,
+            ], 0)
             
             if success:
                 self.log("Charge slots cleared")
@@ -310,12 +311,13 @@ class SolisInverterInterface(InverterInterface):
     def clear_discharge_slots(self) -> bool:
         """Clear discharge slot 1 by setting time to 00:00-00:00"""
         try:
-            success = True
-            success &= self.set_value(self.discharge_slot1_start_hour, 0)
-            success &= self.set_value(self.discharge_slot1_start_minute, 0)
-            success &= self.set_value(self.discharge_slot1_end_hour, 0)
-            success &= self.set_value(self.discharge_slot1_end_minute, 0)
-            success &= self.set_value(self.discharge_slot1_current, 0)
+            success = self.set_values([
+                self.discharge_slot1_start_hour,
+                self.discharge_slot1_start_minute,
+                self.discharge_slot1_end_hour,
+                self.discharge_slot1_end_minute,
+                self.discharge_slot1_current,
+            ], 0)
             
             if success:
                 self.log("Discharge slots cleared")
@@ -11,6 +11,7 @@ Learns from patterns in:
 - Seasonal variations
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import statistics
@@ -51,6 +52,13 @@ def _ensure_dependencies():
 
 _ensure_dependencies()
 
+# orjson parses the (often multi-MB) history payload several times faster
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 try:
     from .providers.historical_data_cache import CachedHistoricalDataFetcher
 except ImportError:
@@ -59,6 +67,14 @@ except ImportError:
     except ImportError:
         from historical_data_cache import CachedHistoricalDataFetcher
 
+try:
+    from .providers.timestamps import parse_naive_timestamp
+except ImportError:
+    try:
+        from providers.timestamps import parse_naive_timestamp
+    except ImportError:
+        from timestamps import parse_naive_timestamp
+
 
 class LoadForecaster:
     """
@@ -86,6 +102,12 @@ class LoadForecaster:
         
         # Cached historical data fetcher
         self.cached_fetcher = None
+        self._http_session = None  # requests.Session for REST history, created on first use
+        
+        # Per-run history snapshot used by predict_loads_24h()
+        self._cached_history = None   # Sorted by time
+        self._cached_times = None     # Parallel list of timestamps for bisect
+        self._hour_averages = None    # hour -> 30-day median, filled on demand
     
     def log(self, message: str, level: str = "INFO"):
         """Log a message"""
@@ -212,10 +234,15 @@ class LoadForecaster:
                 'no_attributes': 'true'
             }
             
-            response = requests.get(url, headers=self.hass.headers, params=params, timeout=30)
+            # Keep one session so repeated history fetches reuse the connection,
+            # sharing the harness's own pooled session when it has one
+            if self._http_session is None:
+                self._http_session = getattr(self.hass, 'session', None) or requests.Session()
+            
+            response = self._http_session.get(url, headers=self.hass.headers, params=params, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content) if HAS_ORJSON else response.json()
             
             # Parse response
             history = []
@@ -223,7 +250,7 @@ class LoadForecaster:
                 for state in data[0]:
                     try:
                         load = float(state.get('state'))
-                        timestamp = datetime.fromisoformat(state.get('last_changed').replace('Z', '+00:00')).replace(tzinfo=None)
+                        timestamp = parse_naive_timestamp(state.get('last_changed'))
                         history.append({'time': timestamp, 'load': load})
                     except (ValueError, TypeError):
                         continue
@@ -319,8 +346,11 @@ class LoadForecaster:
     def _get_average_load_for_period(self, start: datetime, end: datetime) -> Optional[float]:
         """Get average load for a specific period (in kW)"""
         # Use pre-fetched cached history if available (much faster!)
-        if hasattr(self, '_cached_history') and self._cached_history is not None:
-            history = [h for h in self._cached_history if start <= h['time'] <= end]
+        # It is time-sorted, so the window is a bisected slice, not a full scan
+        if self._cached_history is not None:
+            lo = bisect_left(self._cached_times, start)
+            hi = bisect_right(self._cached_times, end)
+            history = self._cached_history[lo:hi]
         else:
             # Fallback to fetching (slower)
             history = self.get_historical_load(start, end)
@@ -342,6 +372,10 @@ class LoadForecaster:
     
     def _get_hour_average(self, hour: int, days_back: int = 30) -> Optional[float]:
         """Get average load for a specific hour across multiple days"""
+        # The 48 half-hour slots only cover 24 distinct hours
+        if self._hour_averages is not None and (hour, days_back) in self._hour_averages:
+            return self._hour_averages[(hour, days_back)]
+        
         now = datetime.now()
         samples = []
         
@@ -356,9 +390,10 @@ class LoadForecaster:
             if avg:
                 samples.append(avg)
         
-        if samples:
-            return statistics.median(samples)  # Use median to reduce outlier impact
-        return None
+        result = statistics.median(samples) if samples else None  # Median reduces outlier impact
+        if self._hour_averages is not None:
+            self._hour_averages[(hour, days_back)] = result
+        return result
     
     def _get_trend_prediction(self, target_time: datetime) -> Optional[float]:
         """Predict based on recent trend at this time"""
@@ -409,7 +444,10 @@ class LoadForecaster:
         # OPTIMIZATION: Fetch ALL historical data once (not per prediction!)
         # This prevents 48 predictions × 60+ fetches = thousands of cache calls
         history_start = now - timedelta(days=30)  # Get 30 days of history
-        self._cached_history = self.get_historical_load(history_start, now)
+        self._cached_history = sorted(self.get_historical_load(history_start, now),
+                                      key=lambda h: h['time'])
+        self._cached_times = [h['time'] for h in self._cached_history]
+        self._hour_averages = {}
         self.log(f"[CACHE] Loaded {len(self._cached_history)} historical points for predictions")
         
         try:
@@ -425,6 +463,8 @@ class LoadForecaster:
         finally:
             # Clear cached history after predictions
             self._cached_history = None
+            self._cached_times = None
+            self._hour_averages = None
         
         # Show sample
         self.log(f"Load prediction sample (first 6 slots):")
@@ -0,0 +1,13 @@
+"""
+Log Levels - Shared log level gating
+
+Planners and providers drop messages below their log_level before any
+formatting or output; both use this one table so the levels can't drift.
+"""
+
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+
+def level_enabled(level: str, threshold: str) -> bool:
+    """True if a message at level should be logged under threshold (unknown = INFO)"""
+    return LOG_LEVELS.get(level, 20) >= LOG_LEVELS.get(threshold, 20)
@@ -7,6 +7,7 @@ Compares plan to actual inverter state to avoid unnecessary writes.
 Pure execution logic - no optimization, no decisions, just compare and apply.
 """
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
@@ -124,17 +125,15 @@ class PlanExecutor:
         else:
             current_time = now.replace(minute=30, second=0, microsecond=0)
         
-        # Find matching slot
-        for slot in plan.get('slots', []):
-            slot_time = slot['time']
-            # Check if current_time matches this slot (within 30 min window)
-            if abs((slot_time - current_time).total_seconds()) < 1800:  # 30 minutes
-                return slot
+        # Slots are in time order, so the first one after (current_time - 30min)
+        # is either the slot we're in (within the 30 min window) or, failing
+        # that, the closest future slot
+        slots = plan.get('slots', [])
+        slot_times = [slot['time'] for slot in slots]
+        idx = bisect_right(slot_times, current_time - timedelta(minutes=30))
         
-        # No exact match - get closest future slot
-        future_slots = [s for s in plan.get('slots', []) if s['time'] >= current_time]
-        if future_slots:
-            return future_slots[0]
+        if idx < len(slots):
+            return slots[idx]
         
         return None
     
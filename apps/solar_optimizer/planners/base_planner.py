@@ -6,9 +6,15 @@ Ensures consistent interface across rule-based, ML, and LP planners.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from bisect import bisect_left
+from typing import Dict, List, Optional
 from datetime import datetime
 
+try:
+    from ..log_levels import level_enabled
+except ImportError:
+    from log_levels import level_enabled
+
 
 class BasePlanner(ABC):
     """
@@ -27,11 +33,17 @@ class BasePlanner(ABC):
     # Arbitrage thresholds
     DEFAULT_MIN_PROFIT_MARGIN = 2.0       # pence per kWh minimum profit after losses
     
+    # ── Logging ──
+    LOG_TAG = None      # Short tag shown in log lines (defaults to class name)
+    log_level = 'INFO'  # Messages below this level are dropped before any output
+    
     def __init__(self, charge_efficiency=None, discharge_efficiency=None, min_profit_margin=None):
         self.charge_efficiency = charge_efficiency or self.DEFAULT_CHARGE_EFFICIENCY
         self.discharge_efficiency = discharge_efficiency or self.DEFAULT_DISCHARGE_EFFICIENCY
         self.min_profit_margin = min_profit_margin or self.DEFAULT_MIN_PROFIT_MARGIN
         self.round_trip_efficiency = self.charge_efficiency * self.discharge_efficiency
+        self._physics = None
+        self._physics_key = None
     
     @abstractmethod
     def create_plan(self,
@@ -62,15 +74,83 @@ class BasePlanner(ABC):
         """
         pass
     
-    def log(self, message: str):
+    def log(self, message: str, level: str = "INFO"):
         """
         Log a message (can be overridden by subclasses).
         
+        Messages below log_level return before any formatting or stdout
+        write, so set planner.log_level = 'WARNING' for quiet batch runs.
+        
         Args:
             message: Message to log
+            level: DEBUG, INFO, WARNING or ERROR
         """
+        if not level_enabled(level, self.log_level):
+            return
         timestamp = datetime.now().strftime('%H:%M:%S')
-        print(f"[{timestamp}] [{self.__class__.__name__}] {message}")
+        print(f"[{timestamp}] [{self.LOG_TAG or self.__class__.__name__}] {message}")
+    
+    @staticmethod
+    def _sorted_by_time(entries: List[Dict], key: str):
+        """
+        Sort forecast entries by their datetime field for _find_nearest().
+        
+        Returns:
+            (times, entries) - parallel lists in ascending time order
+        """
+        ordered = sorted(entries, key=lambda e: e[key])
+        return [e[key] for e in ordered], ordered
+    
+    @staticmethod
+    def _find_nearest(times: List[datetime], entries: List[Dict], target: datetime,
+                      tolerance_seconds: float = 300) -> Optional[Dict]:
+        """
+        Binary-search a time-sorted list for the entry closest to target.
+        
+        Only the two neighbours of the insertion point can be closest, so
+        each lookup is O(log n) instead of a scan of the whole forecast.
+        
+        Returns:
+            The matching entry, or None if nothing is within tolerance
+        """
+        idx = bisect_left(times, target)
+        if idx < len(times) and times[idx] == target:
+            return entries[idx]  # Exact slot hit - nothing can be closer
+        
+        best, best_diff = None, tolerance_seconds
+        for j in (idx - 1, idx):
+            if 0 <= j < len(times):
+                diff = abs((times[j] - target).total_seconds())
+                if diff < best_diff:
+                    best, best_diff = entries[j], diff
+        return best
+    
+    def _get_physics(self, battery_capacity: float, max_charge_rate: float,
+                     max_discharge_rate: float, min_soc: float, max_soc: float,
+                     export_limit: float = 5.0):
+        """
+        Return an InverterPhysics for these battery limits, reusing the last one.
+        
+        The model is stateless, and a live system plans with the same battery
+        every cycle, so it is only rebuilt when a limit actually changes.
+        """
+        key = (battery_capacity, max_charge_rate, max_discharge_rate,
+               self.charge_efficiency, self.discharge_efficiency,
+               export_limit, min_soc, max_soc)
+        if self._physics is None or key != self._physics_key:
+            from .inverter_physics import InverterPhysics
+            self._physics = InverterPhysics(
+                battery_capacity=battery_capacity,
+                max_charge_rate=max_charge_rate,
+                max_discharge_rate=max_discharge_rate,
+                charge_efficiency=self.charge_efficiency,
+                discharge_efficiency=self.discharge_efficiency,
+                export_limit=export_limit,
+                min_soc=min_soc,
+                max_soc=max_soc
+            )
+            self._physics_key = key
+        return self._physics
     
     def validate_inputs(self,
                        import_prices: List[Dict],
@@ -24,6 +24,11 @@ from typing import Tuple
 @dataclass
 class SlotResult:
     """Result of simulating one 30-minute slot"""
+    # One of these is built per simulated slot by every planner, so skip the
+    # per-instance __dict__ (spelled out rather than slots=True for Python < 3.10)
+    __slots__ = ('soc_change', 'grid_import_kwh', 'grid_export_kwh', 'battery_charge_kwh',
+                 'battery_discharge_kwh', 'solar_used_kwh', 'clipped_kwh', 'cost_pence', 'action')
+    
     soc_change: float       # Percentage change in SOC
     grid_import_kwh: float  # Energy imported from grid
     grid_export_kwh: float  # Energy exported to grid
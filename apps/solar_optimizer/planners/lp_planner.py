@@ -17,8 +17,10 @@ Limitations:
 Inherits from BasePlanner to ensure consistent interface.
 
 Requires: pip install pulp
+Optional: pip install highspy (in-process HiGHS, used in preference to CBC)
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List
 import sys
@@ -47,24 +49,130 @@ class LinearProgrammingPlanner(BasePlanner):
             4. Mode exclusivity: Only one mode active per slot
     """
     
-    def __init__(self, charge_efficiency=None, discharge_efficiency=None, min_profit_margin=None):
+    LOG_TAG = 'LP'
+    
+    def __init__(self, charge_efficiency=None, discharge_efficiency=None, min_profit_margin=None,
+                 mip_gap_rel: float = None, threads: int = None, time_limit_seconds: float = 30,
+                 debug_infeasibility: bool = False):
+        """
+        Args:
+            mip_gap_rel: Relative MIP gap at which the solver may stop
+                         (None = solver default, i.e. solve to optimality).
+                         A small gap such as 1e-4 trades a little plan
+                         optimality for less branch-and-bound time.
+            threads: Solver threads (None = solver default)
+            time_limit_seconds: Hard cap on solve time
+            debug_infeasibility: Run and log the input checks when the solver
+                                 reports Infeasible
+        """
         super().__init__(charge_efficiency, discharge_efficiency, min_profit_margin)
-        self.solver = PULP_CBC_CMD(msg=0)  # Silent solver
+        self.mip_gap_rel = mip_gap_rel
+        self.threads = threads
+        self.time_limit_seconds = time_limit_seconds
+        self.debug_infeasibility = debug_infeasibility
+        self.solver = self._create_solver()
+        
+        # Previous solution keyed by slot time, used to warm-start the next
+        # solve when the rolling horizon has only moved on a slot or two
+        self._last_solution = {}
+    
+    def _create_solver(self):
+        """
+        Pick the fastest available solver.
+        
+        HiGHS is considerably quicker than CBC on this size of problem, so use
+        it when installed and fall back to the CBC binary bundled with PuLP.
+        The in-process highspy interface is tried first as it avoids writing
+        an LP file and spawning a subprocess for every solve.
+        """
+        options = dict(gapRel=self.mip_gap_rel, threads=self.threads,
+                       timeLimit=self.time_limit_seconds)
+        for solver in (HiGHS(msg=False, **options), HiGHS_CMD(msg=False, **options)):
+            if solver.available():
+                return solver
+        return PULP_CBC_CMD(msg=0, **options)  # Silent solver
     
-    def log(self, message: str):
-        """Log a message"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        print(f"[{timestamp}] [LP] {message}")
+    def _apply_warm_start(self, import_prices: List[Dict], slot_variables: List[tuple]):
+        """
+        Seed variables from the previous solution for any slots it covered.
+        
+        Values are clamped to the new bounds: the old plan's solution can sit
+        a rounding error outside them (e.g. discharge at exactly 2.85 against
+        an upper bound of 3.0 * 0.95) or predate a tightened bound.
+        """
+        if isinstance(self.solver, HiGHS):
+            # PuLP's in-process HiGHS interface takes no start solution and
+            # passes unknown options straight through to highspy
+            return
+        
+        matched = 0
+        for t, variables in enumerate(slot_variables):
+            previous = self._last_solution.get(import_prices[t]['time'])
+            if previous is None:
+                continue
+            for var, val in zip(variables, previous):
+                if val is None:
+                    continue
+                if var.lowBound is not None:
+                    val = max(val, var.lowBound)
+                if var.upBound is not None:
+                    val = min(val, var.upBound)
+                var.setInitialValue(val)
+            matched += 1
+        
+        self.solver.optionsDict['warmStart'] = matched > 0
+        if matched:
+            self.log(f"Warm-starting from previous plan ({matched} slots)", level="DEBUG")
+    
+    def _diagnose_infeasibility(self, battery_soc, battery_capacity, max_charge_rate,
+                                max_discharge_rate, min_soc, max_soc, min_final_soc,
+                                solar_forecast, load_forecast, n_slots) -> List[str]:
+        """
+        Check the inputs against the limits the hard constraints impose.
+        
+        These are heuristic input checks, not a conflict set from the solver
+        (PuLP has no IIS interface), so an empty list doesn't mean the model
+        is sound - only that none of the known causes apply.
+        """
+        failed = []
+        
+        slot_gain = max_charge_rate * self.charge_efficiency * 0.5 / battery_capacity * 100
+        slot_drop = max_discharge_rate * 0.5 / battery_capacity * 100
+        
+        if battery_soc + slot_gain < min_soc:
+            failed.append(f"starting SOC {battery_soc:.1f}% cannot be charged up to the "
+                          f"{min_soc:.0f}% minimum within the first slot")
+        
+        if battery_soc - slot_drop > max_soc:
+            failed.append(f"starting SOC {battery_soc:.1f}% cannot be discharged down to the "
+                          f"{max_soc:.0f}% maximum within the first slot")
+        
+        reachable_soc = min(battery_soc + n_slots * slot_gain, max_soc)
+        if reachable_soc < min_final_soc:
+            failed.append(f"end-of-plan SOC target {min_final_soc:.0f}% is out of reach "
+                          f"(at most {reachable_soc:.1f}% by the last slot)")
+        
+        max_supply = 10.0 + max_discharge_rate * self.discharge_efficiency
+        for t in range(n_slots):
+            shortfall = load_forecast[t]['load_kw'] - solar_forecast[t]['kw'] - max_supply
+            if shortfall > 0:
+                failed.append(f"slot {t}: load exceeds max import + discharge by {shortfall:.2f}kW")
+        
+        return failed
     
     def create_plan(self,
                    import_prices: List[Dict],
                    export_prices: List[Dict],
                    solar_forecast: List[Dict],
                    load_forecast: List[Dict],
-                   system_state: Dict) -> Dict:
+                   system_state: Dict,
+                   force_cold_start: bool = False) -> Dict:
         """
         Create optimal plan using linear programming.
         
+        Slots that overlap the previous plan are seeded with its solution
+        unless force_cold_start is set.
+        
         Returns same format as PlanCreator for compatibility.
         """
         self.log("Creating optimal plan using Linear Programming...")
@@ -84,28 +192,38 @@ class LinearProgrammingPlanner(BasePlanner):
         # Number of time slots
         n_slots = len(import_prices)
         
-        # Handle case where initial SOC might exceed max_soc (e.g. 97% when max is 95%)
-        effective_max_soc = max(max_soc, battery_soc)  # Allow starting above max
+        # Flatten the forecast dicts once so the model build and result
+        # extraction below work on plain per-slot lists
+        slot_times = [p['time'] for p in import_prices]
+        import_rates = [p['price'] for p in import_prices]
+        export_rates = [p['price'] for p in export_prices[:n_slots]]
+        solar_kw_values = [s['kw'] for s in solar_forecast[:n_slots]]
+        load_kw_values = [l['load_kw'] for l in load_forecast[:n_slots]]
         
-        self.log(f"Optimizing {n_slots} slots with LP solver...")
-        self.log(f"Battery: {battery_capacity}kWh, SOC: {battery_soc}%, Charge: {max_charge_rate}kW, Discharge: {max_discharge_rate}kW")
+        self.log(f"Optimizing {n_slots} slots with LP solver ({self.solver.name})...", level="DEBUG")
+        self.log(f"Battery: {battery_capacity}kWh, SOC: {battery_soc}%, Charge: {max_charge_rate}kW, Discharge: {max_discharge_rate}kW", level="DEBUG")
         
         # Create LP problem
         prob = LpProblem("Battery_Optimization", LpMinimize)
         
         # Decision variables for each slot
         # SOC at start of each slot (%)
-        # First slot can be above max_soc if battery is already charged beyond that
-        soc = [LpVariable(f"soc_0", min_soc, effective_max_soc)] + \
-              [LpVariable(f"soc_{t}", min_soc, max_soc) for t in range(1, n_slots + 1)]
+        # The starting SOC is known, so it is substituted as a constant rather
+        # than being a variable pinned by an equality. This also copes with a
+        # battery that starts outside min/max SOC (e.g. 97% when max is 95%).
+        soc = [battery_soc] + [LpVariable(f"soc_{t}", min_soc, max_soc) for t in range(1, n_slots + 1)]
         
         # Grid import/export (kW)
         grid_import = [LpVariable(f"import_{t}", 0, 10) for t in range(n_slots)]  # Max 10kW import
         grid_export = [LpVariable(f"export_{t}", 0, 20) for t in range(n_slots)]  # Max 20kW export (will be constrained by mode)
         
-        # Battery charge/discharge (kW)
+        # Battery charge/discharge (kW, AC side)
+        # Charge is what the inverter draws from the AC bus; discharge is what
+        # it delivers to the AC bus after losses, so the grid balance below
+        # has unit coefficients and only SOC_Balance carries the efficiencies
         battery_charge = [LpVariable(f"charge_{t}", 0, max_charge_rate) for t in range(n_slots)]
-        battery_discharge = [LpVariable(f"discharge_{t}", 0, max_discharge_rate) for t in range(n_slots)]
+        battery_discharge = [LpVariable(f"discharge_{t}", 0, max_discharge_rate * self.discharge_efficiency)
+                             for t in range(n_slots)]
         
         # Binary variable: 1 if charging, 0 if discharging (prevents simultaneous)
         is_charging = [LpVariable(f"is_charging_{t}", cat='Binary') for t in range(n_slots)]
@@ -118,6 +236,10 @@ class LinearProgrammingPlanner(BasePlanner):
         # Clipping (wasted solar) - we want to minimize this!
         clipped_solar = [LpVariable(f"clipped_{t}", 0, 20) for t in range(n_slots)]  # Max 20kW clipping
         
+        # Group per-slot variables so the previous solution can be replayed
+        slot_variables = list(zip(battery_charge, battery_discharge, grid_import, grid_export,
+                                  clipped_solar, is_charging, use_grid_first, soc[1:]))
+        
         # Get export price for battery valuation
         export_price_pkwh = export_prices[0]['price'] if export_prices else 15.0
         
@@ -132,19 +254,23 @@ class LinearProgrammingPlanner(BasePlanner):
         # Terminal SOC target: Penalize ending below 80% SOC
         # This encourages: maximize solar charging, minimize unnecessary discharge
         # Value: If you end below 80%, you'll likely need to import later at avg price
-        avg_import_price = sum(p['price'] for p in import_prices) / len(import_prices)
+        avg_import_price = sum(import_rates) / n_slots
         target_soc = 80.0
         
         # Penalty increases linearly with SOC shortfall
         # e.g., ending at 50% with 10kWh battery: (80-50)/100 * 10 * 20p / 100 = £0.60 penalty
         soc_shortfall = (target_soc - soc[n_slots]) / 100 * battery_capacity * avg_import_price / 100
         
-        total_cost = lpSum([
-            import_prices[t]['price'] * grid_import[t] * 0.5 / 100  # Import cost (£)
-            - export_prices[t]['price'] * grid_export[t] * 0.5 / 100  # Export revenue (£)
-            + clipping_penalty * clipped_solar[t] * 0.5 / 100  # Clipping penalty (£)
-            for t in range(n_slots)
-        ]) + soc_shortfall  # Penalty for ending below target SOC
+        # Build the objective straight from (variable, coefficient) pairs so
+        # PuLP doesn't create intermediate expressions for every product
+        clipping_coef = clipping_penalty * 0.5 / 100
+        objective_terms = []
+        for t in range(n_slots):
+            objective_terms.append((grid_import[t], import_rates[t] * 0.5 / 100))   # Import cost (£)
+            objective_terms.append((grid_export[t], -export_rates[t] * 0.5 / 100))  # Export revenue (£)
+            objective_terms.append((clipped_solar[t], clipping_coef))               # Clipping penalty (£)
+        
+        total_cost = LpAffineExpression(objective_terms) + soc_shortfall  # Penalty for ending below target SOC
         
         prob += total_cost, "Total_Cost"
         
@@ -155,66 +281,73 @@ class LinearProgrammingPlanner(BasePlanner):
         min_final_soc = 40.0
         prob += soc[n_slots] >= min_final_soc, "Minimum_Final_SOC"
         
-        # Constraints
-        
-        # 1. Initial SOC
-        prob += soc[0] == battery_soc, "Initial_SOC"
+        # 1. Initial SOC - substituted as a constant in soc[0] above
         
         # 2. Energy balance for each slot
         # Round-trip efficiency from base class settings
         charge_efficiency = self.charge_efficiency
         discharge_efficiency = self.discharge_efficiency
         
+        # SOC change (as percentage) per kW of charge/discharge over one slot
+        # (30 min = 0.5h). Folding the slot length, efficiency and capacity
+        # into one coefficient each keeps the SOC rows to four terms.
+        # Charging: only charge_efficiency of input reaches battery
+        # Discharging: only discharge_efficiency of stored energy reaches output,
+        # so the battery gives up discharge / discharge_efficiency
+        charge_soc_per_kw = charge_efficiency * 0.5 / battery_capacity * 100
+        discharge_soc_per_kw = 0.5 / discharge_efficiency / battery_capacity * 100
+        
         for t in range(n_slots):
-            solar_kw = solar_forecast[t]['kw']
-            load_kw = load_forecast[t]['load_kw']
-            
-            # Battery energy change (30 min = 0.5h)
-            # Charging: only charge_efficiency of input reaches battery
-            # Discharging: only discharge_efficiency of stored energy reaches output
-            battery_kwh_in = battery_charge[t] * charge_efficiency * 0.5
-            battery_kwh_out = battery_discharge[t] * 0.5  # Full kW drawn from battery
+            solar_kw = solar_kw_values[t]
+            load_kw = load_kw_values[t]
             
-            # SOC change (as percentage) - what actually enters/leaves the battery
-            soc_change = ((battery_kwh_in - battery_kwh_out) / battery_capacity) * 100
-            
-            prob += soc[t+1] == soc[t] + soc_change, f"SOC_Balance_{t}"
+            prob += (soc[t+1] == soc[t] + charge_soc_per_kw * battery_charge[t]
+                     - discharge_soc_per_kw * battery_discharge[t]), f"SOC_Balance_{t}"
             
             # CORRECT Energy balance (AC side):
-            # Energy IN: solar + grid_import + battery_discharge * discharge_efficiency
+            # Energy IN: solar + grid_import + battery_discharge
             # Energy OUT: load + battery_charge + grid_export + clipping
             # 
-            # Discharge efficiency: only 95% of battery output reaches AC bus
-            # Charge: full kW drawn from AC side (losses are on battery side, handled in SOC)
-            prob += (grid_import[t] + battery_discharge[t] * discharge_efficiency 
+            # Both battery terms are AC-side, so losses live entirely in SOC_Balance
+            prob += (grid_import[t] + battery_discharge[t]
                     - battery_charge[t] - grid_export[t] == 
                     load_kw + clipped_solar[t] - solar_kw), f"Grid_Balance_{t}"
         
         # 3. Can't charge and discharge simultaneously
         # Use binary variable: if is_charging=1, can charge but not discharge
         #                      if is_charging=0, can discharge but not charge
+        # These rows are never referred to by name, so leave them anonymous
+        # rather than formatting two names per slot
         M = 10  # Big number (max possible power)
         for t in range(n_slots):
             # If is_charging=1: charge can be up to max_charge_rate, discharge must be 0
             # If is_charging=0: discharge can be up to max_discharge_rate, charge must be 0
-            prob += battery_charge[t] <= M * is_charging[t], f"Charge_If_Charging_{t}"
-            prob += battery_discharge[t] <= M * (1 - is_charging[t]), f"Discharge_If_Not_Charging_{t}"
+            prob += battery_charge[t] <= M * is_charging[t]
+            prob += battery_discharge[t] <= M * (1 - is_charging[t])
         
         # 4. NEW: Export limit depends on mode (Self-Use vs Grid-First)
         # If use_grid_first=0 (Self-Use): export limited to 5kW (DNO limit)
         # If use_grid_first=1 (Grid-First): export limited to 20kW (no practical limit)
         # Constraint: grid_export[t] <= 5 + 15 * use_grid_first[t]
         for t in range(n_slots):
-            prob += grid_export[t] <= 5.0 + 15.0 * use_grid_first[t], f"Export_Limit_{t}"
+            prob += grid_export[t] <= 5.0 + 15.0 * use_grid_first[t]
         
         # 5. Only use Grid-First when there's actual solar to export
-        # Add soft constraint: Grid-First should only be 1 when solar > 3kW
-        # This prevents wasteful Grid-First mode during night/low-solar periods
+        # Grid-First should only be 1 when solar > 3kW, which prevents wasteful
+        # Grid-First mode during night/low-solar periods. Pinning the binary's
+        # bound is equivalent to a per-slot constraint without adding rows.
+        low_solar_slots = 0
         for t in range(n_slots):
-            solar_kw = solar_forecast[t]['kw']
-            if solar_kw < 3.0:  # Low/no solar
-                # Strongly discourage Grid-First mode (but allow if really needed)
-                prob += use_grid_first[t] <= 0.1, f"Discourage_GridFirst_NoSolar_{t}"
+            if solar_kw_values[t] < 3.0:  # Low/no solar
+                use_grid_first[t].upBound = 0
+                low_solar_slots += 1
+        if low_solar_slots:
+            self.log(f"Grid-First disabled in {low_solar_slots} low-solar slots", level="DEBUG")
+        
+        # Seed from the previous plan now all the variable bounds are final
+        if force_cold_start:
+            self._last_solution = {}
+        self._apply_warm_start(import_prices, slot_variables)
         
         # 6. Clipping only happens when solar exceeds what can be used
         # In Grid-First mode, clipping should be minimal since export limit is higher
@@ -229,8 +362,20 @@ class LinearProgrammingPlanner(BasePlanner):
         # Check if optimal solution found
         status = LpStatus[prob.status]
         if status != 'Optimal':
-            self.log(f"ERROR: Solver status: {status}")
-            self.log(f"Falling back to simple Self-Use plan")
+            self.log(f"ERROR: Solver status: {status}", level="ERROR")
+            failed_checks = []
+            if status == 'Infeasible':
+                if self.debug_infeasibility:
+                    failed_checks = self._diagnose_infeasibility(
+                        battery_soc, battery_capacity, max_charge_rate, max_discharge_rate,
+                        min_soc, max_soc, min_final_soc, solar_forecast, load_forecast, n_slots)
+                    for check in failed_checks:
+                        self.log(f"  Input check failed: {check}", level="WARNING")
+                    if not failed_checks:
+                        self.log("  Input checks all passed; no conflict set found", level="WARNING")
+                else:
+                    self.log("  Set debug_infeasibility=True to diagnose", level="WARNING")
+            self.log(f"Falling back to simple Self-Use plan", level="WARNING")
             
             # Return a simple self-use plan instead of empty
             fallback_slots = []
@@ -259,6 +404,7 @@ class LinearProgrammingPlanner(BasePlanner):
                     'total_cost': 0.0,
                     'solver_status': status,
                     'error': f'LP solver failed with status: {status}, using Self-Use fallback',
+                    'failed_input_checks': failed_checks,
                     'confidence': 'low',
                     'charge_slots': 0,
                     'discharge_slots': 0,
@@ -268,23 +414,32 @@ class LinearProgrammingPlanner(BasePlanner):
             return error_plan
         
         # Extract solution (all values should be valid now)
+        # Pull every variable group out in one pass rather than per slot
+        soc_values = [battery_soc] + [v.varValue for v in soc[1:]]
+        charge_values = [v.varValue for v in battery_charge]
+        # Report discharge as battery-side kW, as before the AC reformulation
+        discharge_values = [v.varValue / self.discharge_efficiency for v in battery_discharge]
+        import_values = [v.varValue for v in grid_import]
+        export_values = [v.varValue for v in grid_export]
+        clipped_values = [v.varValue for v in clipped_solar]
+        grid_first_values = [v.varValue for v in use_grid_first]
+        
         plan_slots = []
+        mode_counts = Counter()
+        cumulative_cost_pence = 0.0
         
         for t in range(n_slots):
-            time = import_prices[t]['time']
-            
-            soc_start = soc[t].varValue
-            soc_end = soc[t+1].varValue
+            time = slot_times[t]
             
-            charge_kw = battery_charge[t].varValue
-            discharge_kw = battery_discharge[t].varValue
-            import_kw = grid_import[t].varValue
-            export_kw = grid_export[t].varValue
-            clipped_kw = clipped_solar[t].varValue
-            is_grid_first = use_grid_first[t].varValue  # NEW: Read the mode decision
+            soc_start = soc_values[t]
+            soc_end = soc_values[t+1]
             
-            # Determine mode from LP solution
-            solar_kw = solar_forecast[t]['kw']
+            charge_kw = charge_values[t]
+            discharge_kw = discharge_values[t]
+            import_kw = import_values[t]
+            export_kw = export_values[t]
+            clipped_kw = clipped_values[t]
+            is_grid_first = grid_first_values[t]  # NEW: Read the mode decision
             
             # Check Grid-First mode (LP's decision)
             if is_grid_first > 0.5:  # Binary variable is 1
@@ -294,7 +449,7 @@ class LinearProgrammingPlanner(BasePlanner):
                 # Charging battery
                 if import_kw > 0.1:
                     mode = 'Force Charge'
-                    action = f"Charging at {charge_kw:.2f}kW from grid (import {import_prices[t]['price']:.2f}p)"
+                    action = f"Charging at {charge_kw:.2f}kW from grid (import {import_rates[t]:.2f}p)"
                 else:
                     mode = 'Self Use'
                     action = f"Charging at {charge_kw:.2f}kW from solar"
@@ -302,7 +457,7 @@ class LinearProgrammingPlanner(BasePlanner):
                 # Discharging battery
                 if export_kw > 0.1:
                     mode = 'Force Discharge'
-                    action = f"Discharging at {discharge_kw:.2f}kW (exporting {export_kw:.2f}kW at {export_prices[t]['price']:.2f}p)"
+                    action = f"Discharging at {discharge_kw:.2f}kW (exporting {export_kw:.2f}kW at {export_rates[t]:.2f}p)"
                 else:
                     mode = 'Self Use'
                     action = f"Discharging at {discharge_kw:.2f}kW to meet load"
@@ -320,15 +475,16 @@ class LinearProgrammingPlanner(BasePlanner):
                 action = f"Self-sufficient (solar ≈ load)"
             
             # Calculate cost for this slot (matching LP objective exactly)
-            import_cost = import_prices[t]['price'] * import_kw * 0.5 / 100  # £
-            export_revenue = export_prices[t]['price'] * export_kw * 0.5 / 100  # £
+            import_cost = import_rates[t] * import_kw * 0.5 / 100  # £
+            export_revenue = export_rates[t] * export_kw * 0.5 / 100  # £
             clipping_cost = (clipping_penalty * clipped_kw * 0.5 / 100) if clipped_kw > 0 else 0  # £
             
             # Total slot cost (matching LP objective)
             slot_cost = import_cost - export_revenue + clipping_cost
             
             # Cumulative cost in pence (slot costs are already in £, so convert)
-            cumulative_cost_pence = sum(plan_slots[i]['cost'] for i in range(len(plan_slots))) + (slot_cost * 100) if plan_slots else (slot_cost * 100)
+            cumulative_cost_pence += slot_cost * 100
+            mode_counts[mode] += 1
             
             plan_slots.append({
                 'time': time,
@@ -336,10 +492,10 @@ class LinearProgrammingPlanner(BasePlanner):
                 'action': action,
                 'soc_start': soc_start,
                 'soc_end': soc_end,
-                'solar_kw': solar_forecast[t]['kw'],
-                'load_kw': load_forecast[t]['load_kw'],
-                'import_price': import_prices[t]['price'],
-                'export_price': export_prices[t]['price'],
+                'solar_kw': solar_kw_values[t],
+                'load_kw': load_kw_values[t],
+                'import_price': import_rates[t],
+                'export_price': export_rates[t],
                 'import_kw': import_kw,  # NEW: Actual grid import
                 'export_kw': export_kw,  # NEW: Actual grid export
                 'charge_kw': charge_kw,  # NEW: Actual battery charge
@@ -348,16 +504,17 @@ class LinearProgrammingPlanner(BasePlanner):
                 'cumulative_cost': cumulative_cost_pence  # Already in pence
             })
         
+        # Remember this solution to warm-start the next plan
+        self._last_solution = {
+            slot_times[t]: [v.varValue for v in slot_variables[t]]
+            for t in range(n_slots)
+        }
+        
         # Use LP objective value as the true cost (already accounts for everything)
         total_cost = value(prob.objective)
         
         # Calculate total clipping
-        total_clipping_kwh = sum(clipped_solar[t].varValue * 0.5 for t in range(n_slots))
-        
-        # Count modes
-        mode_counts = {}
-        for slot in plan_slots:
-            mode_counts[slot['mode']] = mode_counts.get(slot['mode'], 0) + 1
+        total_clipping_kwh = sum(clipped_values) * 0.5
         
         plan = {
             'timestamp': datetime.now(),
@@ -374,15 +531,15 @@ class LinearProgrammingPlanner(BasePlanner):
                     'solar_forecast': len(solar_forecast),
                     'load_forecast': len(load_forecast)
                 },
-                'charge_slots': mode_counts.get('Force Charge', 0),
-                'discharge_slots': mode_counts.get('Force Discharge', 0),
-                'feed_in_slots': mode_counts.get('Feed-in Priority', 0)
+                'charge_slots': mode_counts['Force Charge'],
+                'discharge_slots': mode_counts['Force Discharge'],
+                'feed_in_slots': mode_counts['Feed-in Priority']
             }
         }
         
-        self.log(f"LP solution: {mode_counts.get('Force Charge', 0)} charge, "
-                f"{mode_counts.get('Force Discharge', 0)} discharge, "
-                f"{mode_counts.get('Feed-in Priority', 0)} feed-in, "
+        self.log(f"LP solution: {mode_counts['Force Charge']} charge, "
+                f"{mode_counts['Force Discharge']} discharge, "
+                f"{mode_counts['Feed-in Priority']} feed-in, "
                 f"clipping: {total_clipping_kwh:.2f}kWh, "
                 f"cost: £{total_cost:.2f}")
         
@@ -19,6 +19,7 @@ Requires:
 import json
 import os
 import sys
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -47,6 +48,8 @@ class MLPlanner(BasePlanner):
     - Target SOC levels
     """
     
+    LOG_TAG = 'ML'
+    
     def __init__(self, model_dir: str = "./models", charge_efficiency=None, discharge_efficiency=None, min_profit_margin=None):
         super().__init__(charge_efficiency, discharge_efficiency, min_profit_margin)
         self.model_dir = model_dir
@@ -63,11 +66,6 @@ class MLPlanner(BasePlanner):
         # Load existing models if available
         self.load_models()
     
-    def log(self, message: str):
-        """Log message"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        print(f"[{timestamp}] [ML] {message}")
-    
     def extract_features(self, scenario: Dict) -> np.ndarray:
         """
         Extract features from scenario for ML models.
@@ -400,9 +398,11 @@ class MLPlanner(BasePlanner):
         self.log(f"Battery: {battery_capacity}kWh, Charge: {max_charge_rate}kW, Discharge: {max_discharge_rate}kW")
         
         # Build scenario for ML prediction
-        total_solar = sum(s['kw'] * 0.5 for s in solar_forecast)
-        total_load = sum(l['load_kw'] * 0.5 for l in load_forecast)
-        peak_solar = max(s['kw'] for s in solar_forecast) if solar_forecast else 0
+        solar_kw = np.fromiter((s['kw'] for s in solar_forecast), dtype=np.float64, count=len(solar_forecast))
+        load_kw = np.fromiter((l['load_kw'] for l in load_forecast), dtype=np.float64, count=len(load_forecast))
+        total_solar = float(solar_kw.sum()) * 0.5
+        total_load = float(load_kw.sum()) * 0.5
+        peak_solar = float(solar_kw.max()) if solar_kw.size else 0
         
         scenario = {
             'battery': {
@@ -455,6 +455,7 @@ class MLPlanner(BasePlanner):
         
         # Build plan object
         total_cost = plan_slots[-1].get('cumulative_cost', 0) / 100 if plan_slots else 0.0
+        mode_counts = Counter(s['mode'] for s in plan_slots)
         
         plan = {
             'timestamp': datetime.now(),
@@ -468,8 +469,8 @@ class MLPlanner(BasePlanner):
                     'solar_forecast': len(solar_forecast),
                     'load_forecast': len(load_forecast)
                 },
-                'charge_slots': sum(1 for s in plan_slots if s['mode'] == 'Force Charge'),
-                'discharge_slots': sum(1 for s in plan_slots if s['mode'] == 'Force Discharge'),
+                'charge_slots': mode_counts['Force Charge'],
+                'discharge_slots': mode_counts['Force Discharge'],
                 'ml_prediction': prediction,
                 'planner_type': 'ml_independent'
             }
@@ -535,18 +536,27 @@ class MLPlanner(BasePlanner):
             self.log(f"🌅 ML-GUIDED Pre-sunrise Discharge: {presunrise_strategy['start_time'].strftime('%H:%M')}-{presunrise_strategy['end_time'].strftime('%H:%M')}")
             self.log(f"   Target: {presunrise_strategy['target_soc']:.0f}% SOC")
         
-        # Create physics model for simulation
-        from .inverter_physics import InverterPhysics
-        physics = InverterPhysics(
-            battery_capacity=battery_capacity,
-            max_charge_rate=max_charge_rate,
-            max_discharge_rate=max_discharge_rate,
-            charge_efficiency=self.charge_efficiency,
-            discharge_efficiency=self.discharge_efficiency,
-            export_limit=5.0,
-            min_soc=min_soc,
-            max_soc=max_soc
-        )
+        # Physics model for simulation (reused while the battery limits match)
+        physics = self._get_physics(battery_capacity, max_charge_rate,
+                                    max_discharge_rate, min_soc, max_soc)
+        
+        # Net demand per slot (load - solar, kW) as a flat list, so the
+        # look-aheads below index it rather than slicing the slot list
+        net_need = [slot['load_kw'] - slot['solar_kw'] for slot in slots]
+        
+        # Running total of solar surplus so each slot's 6-hour look-ahead
+        # is a difference of two prefix sums instead of a 12-slot rescan
+        surplus_prefix = [0.0]
+        for need in net_need:
+            surplus_prefix.append(surplus_prefix[-1] + (-need * 0.5 if need < 0 else 0.0))
+        
+        # Cheapest import price from each slot to the end of the plan,
+        # filled in backwards once rather than re-scanned for every slot
+        future_min_prices = [0.0] * len(slots)
+        running_min = float('inf')
+        for i in range(len(slots) - 1, -1, -1):
+            running_min = min(running_min, slots[i]['import_price'])
+            future_min_prices[i] = running_min
         
         # Optimize each slot
         cumulative_cost = 0.0
@@ -560,10 +570,10 @@ class MLPlanner(BasePlanner):
             
             # Future lookahead
             future_deficit = self._calculate_future_deficit(
-                slots[i:], current_soc, battery_capacity, min_soc
+                net_need, i, current_soc, battery_capacity, min_soc
             )
-            future_solar_surplus = self._calculate_future_solar_surplus(slots[i:])
-            future_min_price = min((s['import_price'] for s in slots[i:]), default=import_price)
+            future_solar_surplus = surplus_prefix[min(i + 12, len(slots))] - surplus_prefix[i]
+            future_min_price = future_min_prices[i]
             
             # Decide mode with ML guidance (mode decision only)
             mode, _action, _soc_change = self._decide_mode_ml_guided(
@@ -620,8 +630,9 @@ class MLPlanner(BasePlanner):
             
             current_soc = new_soc
         
-        self.log(f"[OPT] Plan complete: {sum(1 for s in plan if s['mode']=='Force Charge')} charge slots, "
-                f"{sum(1 for s in plan if s['mode']=='Force Discharge')} discharge slots")
+        mode_counts = Counter(s['mode'] for s in plan)
+        self.log(f"[OPT] Plan complete: {mode_counts['Force Charge']} charge slots, "
+                f"{mode_counts['Force Discharge']} discharge slots")
         self.log(f"[OPT] Total estimated cost: £{cumulative_cost/100:.2f} over 24 hours")
         
         return plan
@@ -630,25 +641,30 @@ class MLPlanner(BasePlanner):
     def _align_forecasts(self, prices, solar_forecast, load_forecast) -> List[Dict]:
         """Align all forecasts to common 30-min time slots"""
         slots = []
+        load_times, load_entries = self._sorted_by_time(load_forecast, 'time')
+        
+        # Solcast periods land exactly on the slot boundaries, so an exact-time
+        # dict catches almost every slot; the bisect search handles the rest
+        solar_by_time = {}
+        for sf in solar_forecast:
+            solar_by_time.setdefault(sf['period_end'], sf['pv_estimate'])
+        solar_times, solar_entries = self._sorted_by_time(solar_forecast, 'period_end')
         
         for price in prices[:48]:
             slot_time = price['start']
             
             # Find matching solar
-            solar_kw = 0.0
-            for sf in solar_forecast:
-                time_diff = abs((sf['period_end'] - slot_time).total_seconds())
-                if time_diff < 300:
-                    solar_kw = sf['pv_estimate']
-                    break
+            if slot_time in solar_by_time:
+                solar_kw = solar_by_time[slot_time]
+            else:
+                sf = self._find_nearest(solar_times, solar_entries, slot_time)
+                solar_kw = sf['pv_estimate'] if sf is not None else 0.0
             
             # Find matching load
             load_kw = 1.0
-            for lf in load_forecast:
-                time_diff = abs((lf['time'] - slot_time).total_seconds())
-                if time_diff < 300:
-                    load_kw = lf['load_kw']
-                    break
+            lf = self._find_nearest(load_times, load_entries, slot_time)
+            if lf is not None:
+                load_kw = lf['load_kw']
             
             slots.append({
                 'time': slot_time,
@@ -891,13 +907,13 @@ class MLPlanner(BasePlanner):
             'reason': f"ML-guided pre-sunrise: SOC at sunrise ~{soc_at_sunrise:.0f}%, force to {target_soc:.0f}% ({forced_discharge_kwh:.1f}kWh)"
         }
     
-    def _calculate_future_deficit(self, future_slots, current_soc, battery_capacity, min_soc):
-        """Calculate if we'll run out of battery"""
+    def _calculate_future_deficit(self, net_needs, start, current_soc, battery_capacity, min_soc):
+        """Calculate if we'll run out of battery (from slot `start` on)"""
         available_kwh = (current_soc - min_soc) / 100 * battery_capacity
         deficit_kwh = 0.0
         
-        for slot in future_slots:
-            net_need = slot['load_kw'] - slot['solar_kw']
+        for t in range(start, len(net_needs)):
+            net_need = net_needs[t]
             if net_need > 0:
                 if available_kwh >= net_need * 0.5:
                     available_kwh -= net_need * 0.5
@@ -909,15 +925,6 @@ class MLPlanner(BasePlanner):
         
         return deficit_kwh
     
-    def _calculate_future_solar_surplus(self, future_slots):
-        """Calculate excess solar coming"""
-        surplus = 0.0
-        for slot in future_slots[:12]:
-            net = slot['solar_kw'] - slot['load_kw']
-            if net > 0:
-                surplus += net * 0.5
-        return surplus
-    
     def _decide_mode_ml_guided(self, slot, feed_in_strategy, presunrise_strategy,
                               current_soc, solar_kwh, load_kwh, import_price, export_price,
                               future_deficit, future_solar_surplus, future_min_price,
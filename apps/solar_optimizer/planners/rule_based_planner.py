@@ -11,8 +11,9 @@ Originally PlanCreator, renamed for clarity.
 Inherits from BasePlanner to ensure consistent interface.
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
 import sys
 from pathlib import Path
 
@@ -20,6 +21,16 @@ from pathlib import Path
 from .base_planner import BasePlanner
 
 
+class AlignedSlot(NamedTuple):
+    """One 30-minute slot of prices and forecasts, aligned by _align_forecasts()."""
+    time: datetime
+    solar_kw: float
+    load_kw: float
+    import_price: float
+    is_predicted: bool
+    load_confidence: str
+
+
 class RuleBasedPlanner(BasePlanner):
     """
     Rule-based battery optimization planner.
@@ -37,16 +48,13 @@ class RuleBasedPlanner(BasePlanner):
     All data comes from providers.
     """
     
+    LOG_TAG = 'PLAN'
+    
     def __init__(self, charge_efficiency=None, discharge_efficiency=None, min_profit_margin=None):
         """Initialize plan creator with optional efficiency overrides"""
         super().__init__(charge_efficiency, discharge_efficiency, min_profit_margin)
         self.log_func = print
     
-    def log(self, message: str, level: str = "INFO"):
-        """Log a message"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        print(f"[{timestamp}] [PLAN] {message}")
-    
     def create_plan(self,
                    import_prices: List[Dict],
                    export_prices: List[Dict],
@@ -111,6 +119,7 @@ class RuleBasedPlanner(BasePlanner):
         
         # Build proper plan object
         total_cost = plan_slots[-1].get('cumulative_cost', 0) / 100 if plan_slots else 0.0
+        mode_counts = Counter(s['mode'] for s in plan_slots)
         
         plan = {
             'timestamp': datetime.now(),
@@ -124,8 +133,8 @@ class RuleBasedPlanner(BasePlanner):
                     'solar_forecast': len(solar_forecast),
                     'load_forecast': len(load_forecast)
                 },
-                'charge_slots': sum(1 for s in plan_slots if s['mode'] == 'Force Charge'),
-                'discharge_slots': sum(1 for s in plan_slots if s['mode'] == 'Force Discharge')
+                'charge_slots': mode_counts['Force Charge'],
+                'discharge_slots': mode_counts['Force Discharge']
             }
         }
         
@@ -205,36 +214,51 @@ class RuleBasedPlanner(BasePlanner):
             self.log(f"   Target: {presunrise_discharge_strategy['target_soc']:.0f}% SOC")
             self.log(f"   Reason: {presunrise_discharge_strategy['reason']}")
         
-        # Create physics model for simulation
-        from .inverter_physics import InverterPhysics
-        physics = InverterPhysics(
-            battery_capacity=battery_capacity,
-            max_charge_rate=max_charge_rate,
-            max_discharge_rate=max_discharge_rate,
-            charge_efficiency=self.charge_efficiency,
-            discharge_efficiency=self.discharge_efficiency,
-            export_limit=5.0,
-            min_soc=min_soc,
-            max_soc=max_soc
-        )
+        # Physics model for simulation (reused while the battery limits match)
+        physics = self._get_physics(battery_capacity, max_charge_rate,
+                                    max_discharge_rate, min_soc, max_soc)
+        
+        # Net demand per slot (load - solar, kW) as a flat list, so the
+        # look-aheads below index it rather than re-reading the slot dicts
+        net_need = [slot.load_kw - slot.solar_kw for slot in slots]
+        
+        # Running total of solar surplus so each slot's 6-hour look-ahead
+        # is a difference of two prefix sums instead of a 12-slot rescan
+        surplus_prefix = [0.0]
+        for need in net_need:
+            surplus_prefix.append(surplus_prefix[-1] + (-need * 0.5 if need < 0 else 0.0))
+        
+        # Cheapest import price from each slot to the end of the plan,
+        # filled in backwards once rather than re-scanned for every slot
+        future_min_prices = [0.0] * len(slots)
+        running_min = float('inf')
+        for i in range(len(slots) - 1, -1, -1):
+            running_min = min(running_min, slots[i].import_price)
+            future_min_prices[i] = running_min
+        
+        # Cost and mode tallies are kept as we go rather than in later passes
+        cumulative = 0.0
+        mode_counts = Counter()
         
         for i, slot in enumerate(slots):
-            # Store future slots for clipping analysis
-            self._future_slots = slots[i:]
-            
             # Calculate energy balance for this slot
-            solar_kw = slot['solar_kw']
-            load_kw = slot['load_kw']
+            solar_kw = slot.solar_kw
+            load_kw = slot.load_kw
             solar_kwh = solar_kw * 0.5  # 30 minutes
             load_kwh = load_kw * 0.5
-            import_price = slot['import_price']
+            import_price = slot.import_price
             
             # Look ahead to make smart decisions
-            future_deficit = self._calculate_future_deficit(
-                slots[i:], current_soc, battery_capacity, min_soc
-            )
-            future_solar_surplus = self._calculate_future_solar_surplus(slots[i:])
-            future_min_price = min((s['import_price'] for s in slots[i:]), default=import_price)
+            # The deficit scan walks every remaining slot, but _decide_mode only
+            # acts on it when SOC is below 30%, so skip it otherwise
+            if current_soc < 30:
+                future_deficit = self._calculate_future_deficit(
+                    net_need, i, current_soc, battery_capacity, min_soc
+                )
+            else:
+                future_deficit = 0.0
+            future_solar_surplus = surplus_prefix[min(i + 12, len(slots))] - surplus_prefix[i]  # Next 6 hours
+            future_min_price = future_min_prices[i]
             
             # Decide mode (strategy decision only)
             mode, _action, _soc_change = self._decide_mode(
@@ -273,34 +297,31 @@ class RuleBasedPlanner(BasePlanner):
             soc_change = result.soc_change
             new_soc = max(min_soc, min(max_soc, current_soc + soc_change))
             slot_cost = result.cost_pence
+            cumulative += slot_cost
+            mode_counts[mode] += 1
             
             plan.append({
-                'time': slot['time'],
+                'time': slot.time,
                 'mode': mode,
                 'action': action,
                 'soc_start': current_soc,
                 'soc_end': new_soc,
                 'soc_change': soc_change,
-                'solar_kw': slot['solar_kw'],
-                'load_kw': slot['load_kw'],
+                'solar_kw': slot.solar_kw,
+                'load_kw': slot.load_kw,
                 'import_price': import_price,
                 'export_price': export_price,
                 'cost': slot_cost,  # Cost in pence for this slot
-                'is_predicted_price': slot.get('is_predicted', False),
-                'load_confidence': slot.get('load_confidence', 'unknown')
+                'cumulative_cost': cumulative,
+                'is_predicted_price': slot.is_predicted,
+                'load_confidence': slot.load_confidence
             })
             
             current_soc = new_soc
         
-        # Calculate cumulative costs
-        cumulative = 0.0
-        for step in plan:
-            cumulative += step['cost']
-            step['cumulative_cost'] = cumulative
-        
         # Log summary
-        charge_slots = sum(1 for p in plan if p['mode'] == 'Force Charge')
-        discharge_slots = sum(1 for p in plan if p['mode'] == 'Force Discharge')
+        charge_slots = mode_counts['Force Charge']
+        discharge_slots = mode_counts['Force Discharge']
         total_cost = cumulative / 100  # Convert pence to pounds
         
         self.log(f"[OPT] Plan complete: {charge_slots} charge slots, {discharge_slots} discharge slots")
@@ -308,10 +329,7 @@ class RuleBasedPlanner(BasePlanner):
         
         return plan
     
-        
-        return plan
-    
-    def _should_use_feed_in_priority_strategy(self, slots: List[Dict], current_soc: float, 
+    def _should_use_feed_in_priority_strategy(self, slots: List[AlignedSlot], current_soc: float, 
                                                battery_capacity: float, export_limit: float = 5.0,
                                                max_charge_rate: float = None) -> Dict:
         """
@@ -356,8 +374,8 @@ class RuleBasedPlanner(BasePlanner):
         su_full_at_idx = None
         
         for i, slot in enumerate(slots):
-            solar_kw = slot.get('solar_kw', 0)
-            load_kw = slot.get('load_kw', 0)
+            solar_kw = slot.solar_kw
+            load_kw = slot.load_kw
             
             net_solar = max(0, solar_kw - load_kw)
             
@@ -394,7 +412,7 @@ class RuleBasedPlanner(BasePlanner):
         # Start: first slot with meaningful solar
         fi_start_idx = None
         for i, slot in enumerate(slots):
-            if slot.get('solar_kw', 0) > 0.5:
+            if slot.solar_kw > 0.5:
                 fi_start_idx = i
                 break
         
@@ -403,10 +421,12 @@ class RuleBasedPlanner(BasePlanner):
                     'reason': 'No solar slots found'}
         
         # End of solar window: last slot with meaningful solar
+        # Scan back from the end so we stop at the first hit
         fi_solar_end_idx = fi_start_idx
-        for i, slot in enumerate(slots):
-            if slot.get('solar_kw', 0) > 0.5:
+        for i in range(len(slots) - 1, fi_start_idx, -1):
+            if slots[i].solar_kw > 0.5:
                 fi_solar_end_idx = i
+                break
         
         # ── Step 3: Backwards simulation to find transition point ──
         # Start at end of solar window with target SOC = 95% (we want battery full by then)
@@ -419,8 +439,8 @@ class RuleBasedPlanner(BasePlanner):
         
         for i in range(fi_solar_end_idx, fi_start_idx - 1, -1):
             slot = slots[i]
-            solar_kw = slot.get('solar_kw', 0)
-            load_kw = slot.get('load_kw', 0)
+            solar_kw = slot.solar_kw
+            load_kw = slot.load_kw
             
             net_solar = solar_kw - load_kw
             
@@ -452,8 +472,8 @@ class RuleBasedPlanner(BasePlanner):
         
         for i in range(fi_start_idx, fi_solar_end_idx + 1):
             slot = slots[i]
-            solar_kw = slot.get('solar_kw', 0)
-            load_kw = slot.get('load_kw', 0)
+            solar_kw = slot.solar_kw
+            load_kw = slot.load_kw
             
             if i < transition_idx:
                 # Feed-in Priority: grid gets first 5kW, remainder to load+battery
@@ -499,10 +519,10 @@ class RuleBasedPlanner(BasePlanner):
                 'reason': f"Feed-in Priority only saves {clip_saved:.1f}kWh - not worth it"
             }
         
-        start_time = slots[fi_start_idx]['time']
-        transition_time = slots[transition_idx]['time']
-        su_full_time = slots[su_full_at_idx]['time'].strftime('%H:%M') if su_full_at_idx is not None else 'never'
-        fi_full_time = slots[fi_full_at_idx]['time'].strftime('%H:%M') if fi_full_at_idx is not None else 'never'
+        start_time = slots[fi_start_idx].time
+        transition_time = slots[transition_idx].time
+        su_full_time = slots[su_full_at_idx].time.strftime('%H:%M') if su_full_at_idx is not None else 'never'
+        fi_full_time = slots[fi_full_at_idx].time.strftime('%H:%M') if fi_full_at_idx is not None else 'never'
         
         return {
             'use_strategy': True,
@@ -514,7 +534,7 @@ class RuleBasedPlanner(BasePlanner):
                       f"then Self-Use")
         }
     
-    def _calculate_presunrise_discharge_strategy(self, slots: List[Dict], current_soc: float,
+    def _calculate_presunrise_discharge_strategy(self, slots: List[AlignedSlot], current_soc: float,
                                                   battery_capacity: float, max_discharge_rate: float,
                                                   feed_in_strategy: Dict) -> Dict:
         """
@@ -529,14 +549,14 @@ class RuleBasedPlanner(BasePlanner):
         """
         import math
         
-        now = slots[0]['time'] if slots else datetime.now()
+        now = slots[0].time if slots else datetime.now()
         
         # Find sunrise (first slot with solar > 0.5kW)
         sunrise_time = None
         sunrise_slot_idx = None
         for i, slot in enumerate(slots):
-            if slot.get('solar_kw', 0) > 0.5:
-                sunrise_time = slot['time']
+            if slot.solar_kw > 0.5:
+                sunrise_time = slot.time
                 sunrise_slot_idx = i
                 break
         
@@ -548,14 +568,14 @@ class RuleBasedPlanner(BasePlanner):
         battery_absorption_kwh = 0
         
         for slot in slots:
-            solar_kw = slot.get('solar_kw', 0)
-            load_kw = slot.get('load_kw', 0)
+            solar_kw = slot.solar_kw
+            load_kw = slot.load_kw
             
             if solar_kw < 0.5:
                 continue
             
             if feed_in_strategy['use_strategy']:
-                slot_time = slot['time']
+                slot_time = slot.time
                 if feed_in_strategy['start_time'] <= slot_time <= feed_in_strategy['end_time']:
                     after_grid = max(0, solar_kw - export_limit)
                     after_load = max(0, after_grid - load_kw)
@@ -571,8 +591,8 @@ class RuleBasedPlanner(BasePlanner):
         # The battery will lose charge naturally through household load
         soc_at_sunrise = current_soc
         for i in range(sunrise_slot_idx):
-            load_kw = slots[i].get('load_kw', 0)
-            solar_kw = slots[i].get('solar_kw', 0)
+            load_kw = slots[i].load_kw
+            solar_kw = slots[i].solar_kw
             net_drain = max(0, load_kw - solar_kw)  # Only drain if load > solar
             drain_kwh = net_drain * 0.5  # 30-min slot
             soc_drop = (drain_kwh / battery_capacity) * 100
@@ -606,7 +626,7 @@ class RuleBasedPlanner(BasePlanner):
             return {'use_strategy': False, 'reason': 'Not enough time before sunrise'}
         
         discharge_start_idx = sunrise_slot_idx - discharge_slots_needed
-        discharge_start_time = slots[discharge_start_idx]['time']
+        discharge_start_time = slots[discharge_start_idx].time
         
         # Make sure discharge starts after current time
         if discharge_start_time <= now:
@@ -624,9 +644,17 @@ class RuleBasedPlanner(BasePlanner):
                       f"before sunrise at {sunrise_time.strftime('%H:%M')}")
         }
     
-    def _align_forecasts(self, prices, solar_forecast, load_forecast) -> List[Dict]:
+    def _align_forecasts(self, prices, solar_forecast, load_forecast) -> List[AlignedSlot]:
         """Align all forecasts to common 30-min time slots"""
         slots = []
+        load_times, load_entries = self._sorted_by_time(load_forecast, 'time')
+        
+        # Solcast periods land exactly on the slot boundaries, so an exact-time
+        # dict catches almost every slot; the bisect search handles the rest
+        solar_by_time = {}
+        for sf in solar_forecast:
+            solar_by_time.setdefault(sf['period_end'], sf['pv_estimate'])
+        solar_times, solar_entries = self._sorted_by_time(solar_forecast, 'period_end')
         
         for price in prices[:48]:  # 24 hours
             slot_time = price['start']
@@ -634,41 +662,39 @@ class RuleBasedPlanner(BasePlanner):
             # Find matching solar
             # Solar forecast 'period_end' is actually the slot time (despite the name)
             # Match within 5 minutes to handle slight timing differences
-            solar_kw = 0.0
-            for sf in solar_forecast:
-                time_diff = abs((sf['period_end'] - slot_time).total_seconds())
-                if time_diff < 300:  # Within 5 minutes
-                    solar_kw = sf['pv_estimate']
-                    break
+            if slot_time in solar_by_time:
+                solar_kw = solar_by_time[slot_time]
+            else:
+                sf = self._find_nearest(solar_times, solar_entries, slot_time)
+                solar_kw = sf['pv_estimate'] if sf is not None else 0.0
             
             # Find matching load
             load_kw = 1.0  # Default 1kW if no forecast
             load_confidence = 'unknown'
-            for lf in load_forecast:
-                time_diff = abs((lf['time'] - slot_time).total_seconds())
-                if time_diff < 300:  # Within 5 minutes
-                    load_kw = lf['load_kw']
-                    load_confidence = lf.get('confidence', 'unknown')
-                    break
+            lf = self._find_nearest(load_times, load_entries, slot_time)  # Within 5 minutes
+            if lf is not None:
+                load_kw = lf['load_kw']
+                load_confidence = lf.get('confidence', 'unknown')
             
-            slots.append({
-                'time': slot_time,
-                'solar_kw': solar_kw,
-                'load_kw': load_kw,
-                'import_price': price['price'],
-                'is_predicted': price.get('is_predicted', False),
-                'load_confidence': load_confidence
-            })
+            slots.append(AlignedSlot(
+                time=slot_time,
+                solar_kw=solar_kw,
+                load_kw=load_kw,
+                import_price=price['price'],
+                is_predicted=price.get('is_predicted', False),
+                load_confidence=load_confidence
+            ))
         
         return slots
     
-    def _calculate_future_deficit(self, future_slots, current_soc, battery_capacity, min_soc) -> float:
-        """Calculate if we'll run out of battery without charging"""
+    def _calculate_future_deficit(self, net_needs: List[float], start: int, current_soc,
+                                  battery_capacity, min_soc) -> float:
+        """Calculate if we'll run out of battery without charging (from slot `start` on)"""
         available_kwh = (current_soc - min_soc) / 100 * battery_capacity
         deficit_kwh = 0.0
         
-        for slot in future_slots:
-            net_need = slot['load_kw'] - slot['solar_kw']
+        for t in range(start, len(net_needs)):
+            net_need = net_needs[t]
             if net_need > 0:
                 if available_kwh >= net_need * 0.5:
                     available_kwh -= net_need * 0.5
@@ -681,17 +707,6 @@ class RuleBasedPlanner(BasePlanner):
         
         return deficit_kwh
     
-    def _calculate_future_solar_surplus(self, future_slots) -> float:
-        """Calculate how much excess solar we'll have"""
-        surplus = 0.0
-        
-        for slot in future_slots[:12]:  # Next 6 hours
-            net = slot['solar_kw'] - slot['load_kw']
-            if net > 0:
-                surplus += net * 0.5
-        
-        return surplus
-    
     def _decide_mode(self, slot, feed_in_priority_strategy, presunrise_discharge_strategy,
                      current_soc, solar_kwh, load_kwh, import_price, export_price,
                      future_deficit, future_solar_surplus, future_min_price,
@@ -724,7 +739,7 @@ class RuleBasedPlanner(BasePlanner):
         # 0a. PRE-SUNRISE DISCHARGE (Create battery space before solar arrives)
         # Check if this slot falls within the pre-sunrise discharge window
         if presunrise_discharge_strategy['use_strategy']:
-            slot_time = slot['time']
+            slot_time = slot.time
             target_soc = presunrise_discharge_strategy['target_soc']
             
             # Only discharge if we haven't reached the target yet
@@ -746,7 +761,7 @@ class RuleBasedPlanner(BasePlanner):
         # Grid gets first 5kW, load from remainder, battery gets overflow
         # CRITICAL: Only use when there's actual solar to route - pointless with 0kW solar
         if feed_in_priority_strategy['use_strategy']:
-            slot_time = slot['time']
+            slot_time = slot.time
             solar_kw = solar_kwh * 2  # Convert back to kW
             if (feed_in_priority_strategy['start_time'] <= slot_time <= 
                 feed_in_priority_strategy['end_time'] and solar_kw > 0.5):
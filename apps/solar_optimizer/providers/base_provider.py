@@ -9,6 +9,11 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+try:
+    from ..log_levels import level_enabled
+except ImportError:
+    from log_levels import level_enabled
+
 
 class DataProvider(ABC):
     """
@@ -21,6 +26,9 @@ class DataProvider(ABC):
     - Being independently testable
     """
     
+    # ── Logging ──
+    log_level = 'INFO'  # Messages below this level are dropped before reaching hass/stdout
+    
     def __init__(self, hass):
         """
         Initialize provider.
@@ -34,7 +42,9 @@ class DataProvider(ABC):
         self._health_status = 'unknown'
     
     def log(self, message: str, level: str = "INFO"):
-        """Log a message"""
+        """Log a message (dropped early if below log_level)"""
+        if not level_enabled(level, self.log_level):
+            return
         if hasattr(self.hass, 'log'):
             self.hass.log(message, level=level)
         else:
@@ -13,6 +13,8 @@ try:
 except ImportError:
     from base_provider import DataProvider
 
+SLOT_DURATION = timedelta(minutes=30)
+
 
 class ExportPricingProvider(DataProvider):
     """
@@ -106,15 +108,7 @@ class ExportPricingProvider(DataProvider):
                 current_rate = current_rate * 100
             
             # Generate forecast (all same for now - would need Agile Export API)
-            now = datetime.now()
-            start = now.replace(minute=0 if now.minute < 30 else 30, second=0, microsecond=0)
-            
-            for i in range(hours * 2):  # 30-min slots
-                slot_time = start + timedelta(minutes=30 * i)
-                prices.append({
-                    'time': slot_time,
-                    'price': current_rate
-                })
+            prices = [{'time': slot_time, 'price': current_rate} for slot_time in self._slot_times(hours)]
             
             self._last_update = datetime.now()
             self._health_status = 'healthy'
@@ -128,25 +122,25 @@ class ExportPricingProvider(DataProvider):
     
     def _get_fixed_export(self, hours: int) -> List[Dict]:
         """Generate fixed export rate forecast"""
-        prices = []
-        
         rate = self.fixed_rate if self.fixed_rate is not None else 15.0
-        
-        now = datetime.now()
-        start = now.replace(minute=0 if now.minute < 30 else 30, second=0, microsecond=0)
-        
-        for i in range(hours * 2):  # 30-min slots
-            slot_time = start + timedelta(minutes=30 * i)
-            prices.append({
-                'time': slot_time,
-                'price': rate
-            })
+        prices = [{'time': slot_time, 'price': rate} for slot_time in self._slot_times(hours)]
         
         self._last_update = datetime.now()
         self._health_status = 'healthy'
         
         return prices
     
+    def _slot_times(self, hours: int) -> List[datetime]:
+        """Half-hour slot start times for the next N hours, from the current slot"""
+        now = datetime.now()
+        slot_time = now.replace(minute=0 if now.minute < 30 else 30, second=0, microsecond=0)
+        
+        slot_times = []
+        for _ in range(hours * 2):  # 30-min slots
+            slot_times.append(slot_time)
+            slot_time += SLOT_DURATION
+        return slot_times
+    
     def get_export_price(self) -> float:
         """
         Get current export price in pence/kWh.
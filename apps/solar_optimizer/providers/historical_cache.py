@@ -12,11 +12,50 @@ Features:
 """
 
 import json
+import math
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
 
+# orjson (optional) encodes/decodes the cache several times faster than json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def load_cache_json(raw: bytes):
+    """
+    Decode a cache file, with orjson when installed.
+    
+    Files written by json.dump may contain NaN/Infinity literals, which
+    orjson rejects, so those fall back to json.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def dump_cache_json(cache_data: Dict) -> bytes:
+    """
+    Encode cache data, with orjson when it round-trips the same as json.
+    
+    orjson writes NaN/Infinity as null and raises on non-str dict keys, so
+    data with non-finite values or such keys is written by json instead.
+    """
+    if HAS_ORJSON and all(not isinstance(item.get('value'), float) or math.isfinite(item['value'])
+                          for item in cache_data.get('data', ())):
+        try:
+            return orjson.dumps(cache_data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(cache_data, indent=2).encode('utf-8')
+
 
 class HistoricalDataCache:
     """
@@ -62,8 +101,8 @@ class HistoricalDataCache:
             if not self.cache_file.exists():
                 return False
             
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
+            with open(self.cache_file, 'rb') as f:
+                cache_data = load_cache_json(f.read())
             
             # Parse timestamps
             self.data = [
@@ -113,8 +152,8 @@ class HistoricalDataCache:
             
             # Write to temp file then rename (atomic operation)
             temp_file = self.cache_file.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            with open(temp_file, 'wb') as f:
+                f.write(dump_cache_json(cache_data))
             
             # Atomic rename
             temp_file.replace(self.cache_file)
@@ -11,7 +11,6 @@ Features:
 - Thread-safe file operations
 """
 
-import json
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
@@ -25,6 +24,12 @@ try:
 except ImportError:
     HAS_FCNTL = False  # Windows doesn't have fcntl
 
+# Cache file encoding (orjson when installed) is shared with historical_cache
+try:
+    from .historical_cache import load_cache_json, dump_cache_json
+except ImportError:
+    from historical_cache import load_cache_json, dump_cache_json
+
 
 def get_cache_directory() -> str:
     """
@@ -106,12 +111,12 @@ class HistoricalDataCache:
             return {'last_updated': None, 'data': []}
         
         try:
-            with open(self.cache_file, 'r') as f:
+            with open(self.cache_file, 'rb') as f:
                 # Lock file for reading (Linux only)
                 if HAS_FCNTL:
                     fcntl.flock(f.fileno(), fcntl.LOCK_SH)
                 try:
-                    cache_data = json.load(f)
+                    cache_data = load_cache_json(f.read())
                 finally:
                     if HAS_FCNTL:
                         fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -165,12 +170,12 @@ class HistoricalDataCache:
             # Write atomically (write to temp file, then rename)
             temp_file = self.cache_file.with_suffix('.tmp')
             
-            with open(temp_file, 'w') as f:
+            with open(temp_file, 'wb') as f:
                 # Lock file for writing (Linux only)
                 if HAS_FCNTL:
                     fcntl.flock(f.fileno(), fcntl.LOCK_EX)
                 try:
-                    json.dump(cache_data, f, indent=2)
+                    f.write(dump_cache_json(cache_data))
                     f.flush()
                     os.fsync(f.fileno())
                 finally:
@@ -41,6 +41,8 @@ def _ensure_dependencies():
 
 _ensure_dependencies()
 
+SLOT_DURATION = timedelta(minutes=30)  # Agile half-hour slot, shared rather than rebuilt per slot
+
 try:
     from .base_provider import DataProvider
     from .time_series_predictor import TimeSeriesPredictor
@@ -73,6 +75,7 @@ class ImportPricingProvider(DataProvider):
         self.price_history = []  # For backward compatibility
         self.predictor = TimeSeriesPredictor(name="agile_pricing")  # AI predictor
         self.price_cache = None  # Persistent cache
+        self._rate_start_cache = {}  # Octopus 'start' string -> naive datetime
     
     def setup(self, config: Dict) -> bool:
         """
@@ -214,18 +217,14 @@ class ImportPricingProvider(DataProvider):
             known_prices = []
             for rate in rates:
                 try:
-                    # Octopus provides ISO format with Z timezone
-                    rate_start = datetime.fromisoformat(rate['start'].replace('Z', '+00:00'))
-                    
-                    # Convert to local time if needed
-                    rate_start = rate_start.replace(tzinfo=None)
+                    rate_start = self._parse_rate_start(rate['start'])
                     
                     # Only include future prices
                     # Octopus value_inc_vat is in POUNDS, convert to pence
                     if rate_start >= now:
                         known_prices.append({
                             'start': rate_start,
-                            'end': rate_start + timedelta(minutes=30),
+                            'end': rate_start + SLOT_DURATION,
                             'price': rate['value_inc_vat'] * 100,  # Convert £ to p
                             'is_predicted': False
                         })
@@ -247,6 +246,22 @@ class ImportPricingProvider(DataProvider):
             self.log(f"Error getting known prices: {e}", level="ERROR")
             return []
     
+    def _parse_rate_start(self, start: str) -> datetime:
+        """
+        Parse an Octopus rate 'start' timestamp, memoized by string.
+        
+        The rates event carries the same day-or-two of slots every time it
+        is read, so each timestamp only needs parsing once.
+        """
+        rate_start = self._rate_start_cache.get(start)
+        if rate_start is None:
+            if len(self._rate_start_cache) > 1000:
+                self._rate_start_cache.clear()
+            # Octopus provides ISO format with Z timezone
+            rate_start = datetime.fromisoformat(start.replace('Z', '+00:00')).replace(tzinfo=None)
+            self._rate_start_cache[start] = rate_start
+        return rate_start
+    
     def get_current_price(self) -> Optional[float]:
         """Get current Agile price (in pence)"""
         try:
@@ -291,8 +306,7 @@ class ImportPricingProvider(DataProvider):
             
             for rate in rates:
                 try:
-                    rate_start = datetime.fromisoformat(rate['start'].replace('Z', '+00:00'))
-                    rate_start = rate_start.replace(tzinfo=None)
+                    rate_start = self._parse_rate_start(rate['start'])
                     
                     # Only load recent history (last 7 days)
                     # Octopus value_inc_vat is in POUNDS, convert to pence
@@ -429,7 +443,7 @@ class ImportPricingProvider(DataProvider):
         end_time = now + timedelta(hours=hours)
         
         while current_time < end_time:
-            slot_end = current_time + timedelta(minutes=30)
+            slot_end = current_time + SLOT_DURATION
             
             if current_time in known_prices_dict:
                 # We have known price
@@ -481,8 +495,8 @@ class ImportPricingProvider(DataProvider):
         predicted_price, confidence = self.predictor.predict(target_time, fallback_value=fallback)
         
         # Log prediction details for transparency
-        if confidence in ['very_high', 'high']:
-            self.log(f"[PREDICT] {target_time.strftime('%H:%M')}: {predicted_price:.2f}p (confidence: {confidence})")
+        if confidence in {'very_high', 'high'}:
+            self.log(f"[PREDICT] {target_time.strftime('%H:%M')}: {predicted_price:.2f}p (confidence: {confidence})", level="DEBUG")
         elif confidence == 'very_low':
             self.log(f"[PREDICT] {target_time.strftime('%H:%M')}: {predicted_price:.2f}p (fallback - no history)", level="WARNING")
         
@@ -4,6 +4,7 @@ Solar Forecast Provider
 Provides PV generation forecast from Solcast.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import os
@@ -13,6 +14,16 @@ try:
 except ImportError:
     from base_provider import DataProvider
 
+try:
+    from .timestamps import parse_naive_timestamp
+except ImportError:
+    try:
+        from providers.timestamps import parse_naive_timestamp
+    except ImportError:
+        from timestamps import parse_naive_timestamp
+
+SLOT_DURATION = timedelta(minutes=30)  # Solcast period length
+
 
 class SolarForecastProvider(DataProvider):
     """
@@ -84,37 +95,42 @@ class SolarForecastProvider(DataProvider):
             # This ensures we include the current 30-min slot
             now_rounded = now.replace(minute=0 if now.minute < 30 else 30, second=0, microsecond=0)
             
-            # Fetch today's forecast
-            self.log(f"[SOLAR] Fetching today from: {self.solcast_entity}")
-            solcast_data_today = self.hass.get_state(self.solcast_entity, attribute='all')
+            # Fetch today's and tomorrow's forecasts together - they are independent
+            # reads, and over the REST API (test harness) each is a full round trip.
+            # Both workers only call hass.get_state, which AppDaemon and the
+            # harness (locked states snapshot) allow from several threads.
+            # ALWAYS fetch tomorrow's forecast (we need it for overnight planning)
+            self.log(f"[SOLAR] Fetching today from: {self.solcast_entity}", level="DEBUG")
+            self.log(f"[SOLAR] Fetching tomorrow from: {self.solcast_entity_tomorrow}", level="DEBUG")
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                today_future = pool.submit(self.hass.get_state, self.solcast_entity, attribute='all')
+                tomorrow_future = pool.submit(self.hass.get_state, self.solcast_entity_tomorrow, attribute='all')
+                solcast_data_today = today_future.result()
+                solcast_data_tomorrow = tomorrow_future.result()
             
             if solcast_data_today and 'attributes' in solcast_data_today:
                 detailed_today = solcast_data_today['attributes'].get('detailedForecast', [])
-                self.log(f"[SOLAR] Today has {len(detailed_today)} raw entries")
+                self.log(f"[SOLAR] Today has {len(detailed_today)} raw entries", level="DEBUG")
                 today_parsed = self._parse_solcast_data(detailed_today, now_rounded)
-                self.log(f"[SOLAR] Today parsed to {len(today_parsed)} future points")
+                self.log(f"[SOLAR] Today parsed to {len(today_parsed)} future points", level="DEBUG")
                 forecast.extend(today_parsed)
             else:
                 self.log("[SOLAR] ❌ No Solcast today data available", level="WARNING")
             
-            # ALWAYS fetch tomorrow's forecast (we need it for overnight planning)
-            self.log(f"[SOLAR] Fetching tomorrow from: {self.solcast_entity_tomorrow}")
-            solcast_data_tomorrow = self.hass.get_state(self.solcast_entity_tomorrow, attribute='all')
-            
             if solcast_data_tomorrow:
-                self.log(f"[SOLAR] Tomorrow entity state: {solcast_data_tomorrow.get('state', 'NO STATE')}")
+                self.log(f"[SOLAR] Tomorrow entity state: {solcast_data_tomorrow.get('state', 'NO STATE')}", level="DEBUG")
                 if 'attributes' in solcast_data_tomorrow:
                     detailed_tomorrow = solcast_data_tomorrow['attributes'].get('detailedForecast', [])
-                    self.log(f"[SOLAR] Tomorrow has {len(detailed_tomorrow)} raw entries")
+                    self.log(f"[SOLAR] Tomorrow has {len(detailed_tomorrow)} raw entries", level="DEBUG")
                     
                     if detailed_tomorrow:
                         # Show first entry for debugging
                         first_entry = detailed_tomorrow[0] if detailed_tomorrow else None
                         if first_entry:
-                            self.log(f"[SOLAR] Tomorrow first entry: {first_entry.get('period_start', 'NO TIME')}")
+                            self.log(f"[SOLAR] Tomorrow first entry: {first_entry.get('period_start', 'NO TIME')}", level="DEBUG")
                         
                         tomorrow_data = self._parse_solcast_data(detailed_tomorrow, now_rounded)
-                        self.log(f"[SOLAR] Tomorrow parsed to {len(tomorrow_data)} future points")
+                        self.log(f"[SOLAR] Tomorrow parsed to {len(tomorrow_data)} future points", level="DEBUG")
                         
                         if tomorrow_data:
                             forecast.extend(tomorrow_data)
@@ -132,12 +148,12 @@ class SolarForecastProvider(DataProvider):
             forecast.sort(key=lambda x: x['time'])
             
             if forecast:
-                self.log(f"[SOLAR] Total before trim: {len(forecast)} points")
-                self.log(f"[SOLAR] Time range: {forecast[0]['time']} to {forecast[-1]['time']}")
+                self.log(f"[SOLAR] Total before trim: {len(forecast)} points", level="DEBUG")
+                self.log(f"[SOLAR] Time range: {forecast[0]['time']} to {forecast[-1]['time']}", level="DEBUG")
             
             # Trim to requested hours
             cutoff = now + timedelta(hours=hours)
-            self.log(f"[SOLAR] Cutoff time: {cutoff} (now + {hours}h)")
+            self.log(f"[SOLAR] Cutoff time: {cutoff} (now + {hours}h)", level="DEBUG")
             forecast = [f for f in forecast if f['time'] <= cutoff]
             
             if forecast:
@@ -161,6 +177,7 @@ class SolarForecastProvider(DataProvider):
     def _parse_solcast_data(self, detailed: List, now: datetime) -> List[Dict]:
         """Parse Solcast detailedForecast data"""
         forecast = []
+        scaling = self.solar_scaling
         
         for entry in detailed:
             try:
@@ -169,26 +186,18 @@ class SolarForecastProvider(DataProvider):
                 
                 # Solcast uses 'period_start'
                 period_start_str = entry.get('period_start')
-                pv_estimate = entry.get('pv_estimate', 0)
-                
                 if not period_start_str:
                     continue
                 
                 # Parse timestamp and add 30 minutes to get period_end
-                period_start = datetime.fromisoformat(
-                    str(period_start_str).replace('Z', '+00:00')
-                ).replace(tzinfo=None)
-                period_end = period_start + timedelta(minutes=30)
+                period_end = parse_naive_timestamp(period_start_str) + SLOT_DURATION
                 
                 # Include current and future periods
                 # now is already rounded to current half-hour slot
                 if period_end >= now:
-                    # Apply scaling factor
-                    scaled_pv = float(pv_estimate) * self.solar_scaling
-                    
                     forecast.append({
                         'time': period_end,
-                        'kw': scaled_pv
+                        'kw': float(entry.get('pv_estimate', 0)) * scaling  # Apply scaling factor
                     })
             
             except Exception as e:
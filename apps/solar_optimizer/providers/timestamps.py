@@ -0,0 +1,33 @@
+"""
+Timestamp Parsing - Shared ISO 8601 helpers
+
+Home Assistant history and Solcast forecasts both send ISO timestamps with
+a UTC offset that the planners don't use.
+"""
+
+from datetime import datetime
+
+# ciso8601 (optional) is a C parser, faster still than fromisoformat
+try:
+    import ciso8601
+    HAS_CISO8601 = True
+except ImportError:
+    HAS_CISO8601 = False
+
+
+def parse_naive_timestamp(value) -> datetime:
+    """
+    Parse an ISO timestamp into a naive datetime, dropping any UTC offset.
+
+    Equivalent to fromisoformat(...).replace(tzinfo=None): the offset is
+    dropped, not applied. Without ciso8601 the offset is sliced off before
+    parsing, as naive parsing is several times faster than offset-aware.
+    """
+    if HAS_CISO8601 and isinstance(value, str):
+        return ciso8601.parse_datetime(value).replace(tzinfo=None)
+    value = str(value)
+    if value.endswith('Z'):
+        return datetime.fromisoformat(value[:-1])
+    if len(value) > 19 and value[-6] in '+-' and value[-3] == ':':
+        return datetime.fromisoformat(value[:-6])
+    return datetime.fromisoformat(value).replace(tzinfo=None)
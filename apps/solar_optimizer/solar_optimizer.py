@@ -14,6 +14,8 @@ This file is ONLY AppDaemon glue.
 import os
 import sys
 import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, time, timezone
 
 import appdaemon.plugins.hass.hassapi as hass
@@ -43,6 +45,8 @@ class SmartSolarOptimizer(hass.Hass):
         self._cached_plan_html = None
         self.plan_sensor = "sensor.solar_optimizer_plan"
         self.wastage_sensor = "sensor.solar_wastage_risk"
+        self._plan_sensor_hash = None
+        self._plan_sensor_pushed_at = None
 
         # Load components
         self._init_providers()
@@ -62,7 +66,10 @@ class SmartSolarOptimizer(hass.Hass):
             self.listen_state(self.on_agile_update, agile_rates)
 
         self.run_hourly(self.update_plan, time(0, 5, 0))
-        self.run_minutely(self.execute_plan_if_time, time(0, 0, 1))
+        # Fire on the Agile slot boundaries themselves rather than polling
+        # every minute and discarding 28 of every 30 callbacks
+        self.run_hourly(self.execute_plan_if_time, time(0, 0, 1))
+        self.run_hourly(self.execute_plan_if_time, time(0, 30, 1))
         self.run_daily(self.record_yesterday_actuals, time(1, 30, 0))
         self.run_in(self.generate_new_plan, 10)
 
@@ -120,7 +127,9 @@ class SmartSolarOptimizer(hass.Hass):
 
         if planner_type == "lp" and LinearProgrammingPlanner:
             try:
-                self.planner = LinearProgrammingPlanner()
+                # Built once and kept for every plan: the solver is set up in
+                # __init__ and each solve is warm-started from the last one
+                self.planner = LinearProgrammingPlanner(mip_gap_rel=self.config.get("lp_mip_gap"))
                 self.log("Using LP planner")
                 return
             except Exception as e:
@@ -151,7 +160,7 @@ class SmartSolarOptimizer(hass.Hass):
         self.set_state(self.plan_sensor, state="initialized", attributes={
             "friendly_name": "Solar Optimizer 24h Plan",
             "icon": "mdi:calendar-clock",
-            "plan": [], "generated_at": None,
+            "generated_at": None,
         })
         self.set_state(self.wastage_sensor, state="0", attributes={
             "friendly_name": "Solar Wastage Risk",
@@ -164,10 +173,27 @@ class SmartSolarOptimizer(hass.Hass):
     def generate_new_plan(self, kwargs=None):
         """Gather data from all providers and run the planner."""
         self.log("Generating new 24-hour plan...")
+        # One clock read per cycle so the plan, the sensor and the
+        # dashboard all agree on when this plan was generated
+        now = datetime.now()
 
         try:
             # ── Gather data from providers ──
-            price_data = self.import_pricing.get_prices_with_confidence(hours=24)
+            # The four sources are independent (Octopus/Agile, export tariff,
+            # Solcast, HA history), so fetch them concurrently. Each provider
+            # only updates its own attributes; the one thing they share is
+            # this app object, and AppDaemon's get_state/log are safe to call
+            # from worker threads (they hand off to the event loop).
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                price_future = pool.submit(self.import_pricing.get_prices_with_confidence, hours=24)
+                export_future = pool.submit(self.export_pricing.get_data, hours=24)
+                solar_future = pool.submit(self.solar_provider.get_data, hours=24)
+                load_future = pool.submit(self.load_forecaster.predict_loads_24h)
+                price_data = price_future.result()
+                export_prices = export_future.result()
+                solar_data = solar_future.result()
+                load_forecast = load_future.result()
+
             if not price_data or not price_data.get('prices'):
                 self.log("Cannot generate plan — no import pricing data", level="WARNING")
                 return
@@ -177,17 +203,14 @@ class SmartSolarOptimizer(hass.Hass):
                 for p in price_data['prices']
             ]
 
-            export_prices = self.export_pricing.get_data(hours=24)
             if not export_prices:
                 rate = float(self.config.get('export_rate', 15.0))
                 export_prices = [{'time': p['time'], 'price': rate} for p in import_prices]
 
-            solar_data = self.solar_provider.get_data(hours=24)
             if not solar_data:
                 self.log("No solar forecast, using zeros", level="WARNING")
                 solar_data = [{'time': p['time'], 'kw': 0} for p in import_prices]
 
-            load_forecast = self.load_forecaster.predict_loads_24h()
             if not load_forecast:
                 self.log("No load forecast, using defaults", level="WARNING")
                 load_forecast = [{'time': p['time'], 'load_kw': 0.5, 'confidence': 'low'}
@@ -217,42 +240,52 @@ class SmartSolarOptimizer(hass.Hass):
             )
 
             # ── Store result ──
+            # Build the new plan completely, then swap it in with a single
+            # assignment so the web route never sees a half-filled plan
+            plan_steps = plan.get('slots', [])
+
+            # Format the dashboard table once per plan; page renders (and
+            # settings saves, which also invalidate the page) reuse it
+            plan_rows, mode_counts = self._format_plan_rows(plan_steps)
+
             self.current_plan = {
-                'timestamp': datetime.now(),
+                'timestamp': now,
                 'battery_soc': inv_state['battery_soc'],
                 'battery_capacity': inv_caps['battery_capacity'],
                 'prices': price_data['prices'],
-                'plan_steps': plan.get('slots', []),
+                'plan_steps': plan_steps,
                 'statistics': price_data.get('statistics', {}),
                 'confidence': price_data.get('confidence', 'unknown'),
                 'hours_known': price_data.get('hours_known', 0),
                 'hours_predicted': price_data.get('hours_predicted', 0),
-                'total_cost': self._calc_total_cost(plan.get('slots', [])),
+                'total_cost': self._calc_total_cost(plan_steps),
                 'metadata': plan.get('metadata', {}),
+                'plan_rows': plan_rows,
+                'mode_counts': mode_counts,
             }
-            self._cached_plan_html = None
 
-            # Update HA sensor
-            mode_counts = {}
-            for step in self.current_plan['plan_steps']:
-                m = step.get('mode', 'Self Use')
-                mode_counts[m] = mode_counts.get(m, 0) + 1
+            # Render the dashboard here, on the scheduler's worker thread, so
+            # page requests are served straight from the cache
+            try:
+                self._cached_plan_html = self._generate_plan_html()
+            except Exception as e:
+                self.log(f"[WEB] Dashboard pre-render failed: {e}", level="WARNING")
+                self._cached_plan_html = None
 
-            self.set_state(self.plan_sensor, state="active", attributes={
+            # Update HA sensor
+            self._publish_plan_sensor({
                 "friendly_name": "Solar Optimizer 24h Plan",
                 "icon": "mdi:calendar-clock",
-                "generated_at": datetime.now().isoformat(),
                 "total_cost": f"£{self.current_plan['total_cost']:.2f}",
                 "mode_counts": mode_counts,
                 "confidence": self.current_plan['confidence'],
-            })
+            }, now)
 
-            # Record predictions for accuracy tracking
+            # Record predictions for accuracy tracking on a worker thread;
+            # the history file write doesn't need to hold up the plan
             if self.accuracy_tracker:
-                try:
-                    self.accuracy_tracker.record_predictions(self.current_plan['plan_steps'])
-                except Exception as e:
-                    self.log(f"Accuracy recording error: {e}", level="WARNING")
+                self.run_in(self._record_predictions, 0,
+                            plan_steps=self.current_plan['plan_steps'])
 
             summary = ", ".join(f"{m}={c}h" for m, c in mode_counts.items() if c > 0)
             self.log(f"Plan generated: Cost: £{self.current_plan['total_cost']:.2f}, {summary}")
@@ -262,6 +295,35 @@ class SmartSolarOptimizer(hass.Hass):
             import traceback
             self.log(traceback.format_exc(), level="ERROR")
 
+    def _record_predictions(self, kwargs):
+        """Record the new plan's predictions; runs off the plan path via run_in."""
+        try:
+            self.accuracy_tracker.record_predictions(kwargs['plan_steps'])
+        except Exception as e:
+            self.log(f"Accuracy recording error: {e}", level="WARNING")
+
+    def _publish_plan_sensor(self, attributes, now):
+        """
+        Push the plan sensor to HA, skipping the write when nothing changed.
+
+        Agile updates can trigger several regenerations in quick succession
+        that land on the same plan; re-posting identical attributes only
+        churns the recorder. A push is still forced every 5 minutes so
+        'generated_at' stays fresh.
+        """
+        digest = hashlib.blake2b(
+            json.dumps(attributes, sort_keys=True, default=str).encode('utf-8'),
+            digest_size=16,
+        ).digest()
+        if (digest == self._plan_sensor_hash and self._plan_sensor_pushed_at
+                and now - self._plan_sensor_pushed_at < timedelta(minutes=5)):
+            return
+
+        self.set_state(self.plan_sensor, state="active",
+                       attributes={**attributes, "generated_at": now.isoformat()})
+        self._plan_sensor_hash = digest
+        self._plan_sensor_pushed_at = now
+
     def _fallback_state(self):
         """Get battery state directly from HA when inverter interface unavailable."""
         return {
@@ -288,7 +350,7 @@ class SmartSolarOptimizer(hass.Hass):
     def execute_plan_if_time(self, kwargs):
         """Execute plan only at :00 and :30 (Agile slot boundaries)."""
         now = datetime.now()
-        if now.minute not in [0, 30]:
+        if now.minute not in {0, 30}:
             return
         if not self.current_plan:
             return
@@ -348,6 +410,37 @@ class SmartSolarOptimizer(hass.Hass):
 
     # ── HTML generation (same approach as test_harness) ──
 
+    def _format_plan_rows(self, plan_steps):
+        """Build the plan table rows and per-mode slot counts in one pass."""
+        mode_counts = {}
+        plan_rows = []
+        for step in plan_steps:
+            mode = step.get('mode', 'Self Use')
+            mode_counts[mode] = mode_counts.get(mode, 0) + 1
+            mode_class = f"mode-{mode.lower().replace(' ', '-')}"
+            pred_marker = " *" if step.get('is_predicted_price', False) else ""
+            slot_cost = step.get('cost', 0)
+            cost_class = "cost-positive" if slot_cost >= 0 else "cost-negative"
+            cumulative = step.get('cumulative_cost', 0) / 100
+            cumulative_str = f"£{cumulative:.2f}" if cumulative >= 0 else f"-£{abs(cumulative):.2f}"
+            mode_display = '⚡ Feed-in Priority' if mode == 'Feed-in Priority' else mode
+            step_time = step.get('time', '')
+            # Plain field formatting - strftime goes through a C struct tm per call
+            time_str = f"{step_time.hour:02d}:{step_time.minute:02d}" if isinstance(step_time, datetime) else str(step_time)
+
+            plan_rows.append(f"""<tr class="{mode_class}">
+                <td><strong>{time_str}</strong></td>
+                <td><strong>{mode_display}</strong></td>
+                <td>{step.get('action', '')}</td>
+                <td>{step.get('soc_end', 0):.1f}%</td>
+                <td>{step.get('solar_kw', 0):.2f}</td>
+                <td>{step.get('import_price', 0):.2f}p{pred_marker}</td>
+                <td>{step.get('export_price', 0):.2f}p</td>
+                <td class="{cost_class}">{abs(slot_cost):.2f}p</td>
+                <td><strong>{cumulative_str}</strong></td>
+            </tr>""")
+        return "".join(plan_rows), mode_counts
+
     def _generate_plan_html(self):
         """Generate full HTML page using templates."""
         if not self.current_plan:
@@ -390,34 +483,8 @@ class SmartSolarOptimizer(hass.Hass):
             <div class="stat-box"><div class="stat-label">24h Cost</div><div class="stat-value">£{plan.get('total_cost', 0):.2f}</div></div>
         """
 
-        mode_counts = {}
-        for step in plan['plan_steps']:
-            m = step.get('mode', 'Self Use')
-            mode_counts[m] = mode_counts.get(m, 0) + 1
-
-        plan_rows = ""
-        for step in plan['plan_steps']:
-            mode_class = f"mode-{step['mode'].lower().replace(' ', '-')}"
-            pred_marker = " *" if step.get('is_predicted_price', False) else ""
-            slot_cost = step.get('cost', 0)
-            cost_class = "cost-positive" if slot_cost >= 0 else "cost-negative"
-            cumulative = step.get('cumulative_cost', 0) / 100
-            cumulative_str = f"£{cumulative:.2f}" if cumulative >= 0 else f"-£{abs(cumulative):.2f}"
-            mode_display = '⚡ Feed-in Priority' if step['mode'] == 'Feed-in Priority' else step['mode']
-            step_time = step.get('time', '')
-            time_str = step_time.strftime('%H:%M') if hasattr(step_time, 'strftime') else str(step_time)
-
-            plan_rows += f"""<tr class="{mode_class}">
-                <td><strong>{time_str}</strong></td>
-                <td><strong>{mode_display}</strong></td>
-                <td>{step.get('action', '')}</td>
-                <td>{step.get('soc_end', 0):.1f}%</td>
-                <td>{step.get('solar_kw', 0):.2f}</td>
-                <td>{step.get('import_price', 0):.2f}p{pred_marker}</td>
-                <td>{step.get('export_price', 0):.2f}p</td>
-                <td class="{cost_class}">{abs(slot_cost):.2f}p</td>
-                <td><strong>{cumulative_str}</strong></td>
-            </tr>"""
+        plan_rows = plan['plan_rows']
+        mode_counts = plan['mode_counts']
 
         info_summary = f"""
             <strong>Plan Summary:</strong><br>
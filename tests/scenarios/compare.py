@@ -8,6 +8,7 @@ Usage:
     python compare.py --latest  # Compare two most recent runs
 """
 
+import heapq
 import json
 import os
 import sys
@@ -15,6 +16,16 @@ from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Run log kept beside the results by runner.py: one {"file": ...} line per
+# saved results file, oldest first
+RESULTS_INDEX = 'index.jsonl'
+
 
 class ResultsComparator:
     """Compare test results from different runs"""
@@ -26,21 +37,48 @@ class ResultsComparator:
         """Load results from JSON file"""
         filepath = os.path.join(self.results_dir, filename) if not os.path.isabs(filename) else filename
         
+        if HAS_ORJSON:
+            with open(filepath, 'rb') as f:
+                return orjson.loads(f.read())
         with open(filepath, 'r') as f:
             return json.load(f)
     
     def get_latest_results(self, n: int = 2) -> List[str]:
         """Get n most recent result files"""
-        files = []
+        latest = self._latest_from_index(n)
+        if latest is not None:
+            return latest
         
-        for filename in os.listdir(self.results_dir):
-            if filename.startswith('results_') and filename.endswith('.json'):
-                filepath = os.path.join(self.results_dir, filename)
-                mtime = os.path.getmtime(filepath)
-                files.append((mtime, filename))
+        # No usable index - scandir entries carry their stat info (from the directory listing
+        # itself on Windows), saving a separate getmtime() per file
+        with os.scandir(self.results_dir) as entries:
+            files = [(entry.stat().st_mtime, entry.name) for entry in entries
+                     if entry.name.startswith('results_') and entry.name.endswith('.json')]
         
-        files.sort(reverse=True)
-        return [f[1] for f in files[:n]]
+        return [f[1] for f in heapq.nlargest(n, files)]
+    
+    def _latest_from_index(self, n: int):
+        """
+        Newest n result files according to the run index, or None if the
+        index is missing or doesn't list n files that still exist.
+        """
+        try:
+            with open(os.path.join(self.results_dir, RESULTS_INDEX), 'rb') as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+        
+        latest = []
+        for line in reversed(lines):
+            try:
+                name = json.loads(line)['file']
+            except (ValueError, KeyError, TypeError):
+                continue
+            if name not in latest and os.path.exists(os.path.join(self.results_dir, name)):
+                latest.append(name)
+                if len(latest) == n:
+                    return latest
+        return None
     
     def compare(self, file1: str, file2: str):
         """Compare two result sets"""
@@ -108,19 +146,17 @@ class ResultsComparator:
         scenarios1 = {r['scenario_name']: r for r in results1['results']}
         scenarios2 = {r['scenario_name']: r for r in results2['results']}
         
-        all_scenarios = set(scenarios1.keys()) | set(scenarios2.keys())
+        # Only scenarios present in both runs can be compared
+        common_scenarios = scenarios1.keys() & scenarios2.keys()
         
         regressions = []
         improvements = []
         new_failures = []
         new_passes = []
         
-        for name in sorted(all_scenarios):
-            r1 = scenarios1.get(name)
-            r2 = scenarios2.get(name)
-            
-            if not r1 or not r2:
-                continue
+        for name in sorted(common_scenarios):
+            r1 = scenarios1[name]
+            r2 = scenarios2[name]
             
             cost1 = r1.get('adjusted_total_cost_pounds', r1.get('total_cost_pounds', 0))
             cost2 = r2.get('adjusted_total_cost_pounds', r2.get('total_cost_pounds', 0))
@@ -10,6 +10,8 @@ Usage:
     python runner.py --planner rule-based      # Use rule-based (default)
     python runner.py --category typical        # Run only typical scenarios
     python runner.py --compare v2.2 v2.3       # Compare two versions
+    python runner.py --workers 4               # Run scenarios in 4 processes
+    python runner.py --keep 20                 # Keep only the 20 newest results files
 """
 
 import json
@@ -18,6 +20,7 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import time
 
 # Add repo root to path
@@ -27,6 +30,34 @@ sys.path.insert(0, os.path.join(REPO_ROOT, 'apps', 'solar_optimizer'))
 
 from apps.solar_optimizer.planners import RuleBasedPlanner
 
+# compare.py is a sibling module: relative when imported as a package
+# (tests.scenarios.runner), by name when run as a script from here
+try:
+    from .compare import RESULTS_INDEX
+except ImportError:
+    from compare import RESULTS_INDEX
+
+# Per-process runner used by --workers (one planner per worker process)
+_worker_runner = None
+
+
+def _init_worker(scenarios_dir: str, results_dir: str, planner_type: str):
+    """Create this worker's runner and planner once, quietly"""
+    global _worker_runner
+    _worker_runner = ScenarioRunner(scenarios_dir, results_dir, planner_type)
+    
+    if planner_type == "lp":
+        # One solver thread per process so workers don't oversubscribe the CPU
+        from apps.solar_optimizer.planners import LinearProgrammingPlanner
+        _worker_runner.plan_creator = LinearProgrammingPlanner(threads=1)
+    
+    # Interleaved planner output from several processes is unreadable
+    _worker_runner.plan_creator.log_level = 'WARNING'
+
+
+def _run_scenario_in_worker(scenario: Dict) -> Dict:
+    return _worker_runner.run_scenario(scenario)
+
 
 class ScenarioRunner:
     """Runs test scenarios and validates results"""
@@ -303,21 +334,11 @@ class ScenarioRunner:
         # Analyze results
         slots = plan['slots']
         
+        # One tally serves both the mode breakdown and the per-mode slot counts
         mode_counts = {}
-        feed_in_slots = []
-        charge_slots = []
-        discharge_slots = []
-        
         for slot in slots:
             mode = slot['mode']
             mode_counts[mode] = mode_counts.get(mode, 0) + 1
-            
-            if mode == 'Feed-in Priority':
-                feed_in_slots.append(slot)
-            elif mode == 'Force Charge':
-                charge_slots.append(slot)
-            elif mode == 'Force Discharge':
-                discharge_slots.append(slot)
         
         total_cost = plan['metadata'].get('total_cost', 0)
         
@@ -348,9 +369,9 @@ class ScenarioRunner:
             'runtime_seconds': round(runtime, 3),
             'plan_metadata': plan['metadata'],
             'mode_counts': mode_counts,
-            'feed_in_priority_hours': len(feed_in_slots) * 0.5,
-            'charge_slot_count': len(charge_slots),
-            'discharge_slot_count': len(discharge_slots),
+            'feed_in_priority_hours': mode_counts.get('Feed-in Priority', 0) * 0.5,
+            'charge_slot_count': mode_counts.get('Force Charge', 0),
+            'discharge_slot_count': mode_counts.get('Force Discharge', 0),
             'total_cost_pounds': round(total_cost, 2),
             'battery_value_start_pounds': round(battery_value_start, 2),
             'battery_value_end_pounds': round(battery_value_end, 2),
@@ -411,8 +432,13 @@ class ScenarioRunner:
         
         return validation
     
-    def run_all(self, category: str = None) -> Dict:
-        """Run all scenarios and return summary"""
+    def run_all(self, category: str = None, workers: int = 1) -> Dict:
+        """
+        Run all scenarios and return summary.
+        
+        Scenarios are independent, so with workers > 1 they are solved in a
+        process pool and reported in their original order.
+        """
         print("\n" + "="*70)
         print("  SolarBat-AI Test Scenario Runner")
         print("="*70)
@@ -431,36 +457,62 @@ class ScenarioRunner:
         passed = 0
         failed = 0
         
-        for i, scenario in enumerate(scenarios, 1):
-            print(f"\n[{i}/{len(scenarios)}] {scenario['category']}/{scenario['name']}")
-            print(f"  {scenario['description']}")
+        # Summary totals are kept as results arrive rather than re-summed afterwards
+        total_raw_cost = 0
+        total_adjusted_cost = 0
+        total_runtime = 0
+        
+        pool = None
+        # Shut the pool down on every exit path, including Ctrl+C, so no
+        # worker processes are left running
+        try:
+            if workers > 1:
+                print(f"Workers: {workers}")
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(self.scenarios_dir, self.results_dir, self.planner_type))
+                futures = [pool.submit(_run_scenario_in_worker, scenario) for scenario in scenarios]
             
-            try:
-                result = self.run_scenario(scenario)
-                results.append(result)
-                
-                # Print key metrics
-                print(f"  ⚡ Feed-in Priority: {result['feed_in_priority_hours']:.1f}h")
-                print(f"  💰 Raw Cost: £{result['total_cost_pounds']:.2f}")
-                print(f"  🔋 Battery Value: £{result['battery_value_start_pounds']:.2f} → £{result['battery_value_end_pounds']:.2f} ({result['battery_value_change_pounds']:+.2f})")
-                print(f"  💷 Adjusted Cost: £{result['adjusted_total_cost_pounds']:.2f}")
-                print(f"  🔋 SOC: {result['battery_start_soc']:.0f}% → {result['battery_end_soc']:.0f}%")
+            for i, scenario in enumerate(scenarios, 1):
+                print(f"\n[{i}/{len(scenarios)}] {scenario['category']}/{scenario['name']}")
+                print(f"  {scenario['description']}")
                 
-                # Validation
-                if result['validation']['passed']:
-                    print(f"  ✅ PASS")
-                    passed += 1
-                else:
-                    print(f"  ❌ FAIL")
-                    for failure in result['validation']['failures']:
-                        print(f"     - {failure}")
+                try:
+                    if pool:
+                        result = futures[i - 1].result()
+                    else:
+                        result = self.run_scenario(scenario)
+                    results.append(result)
+                    total_raw_cost += result['total_cost_pounds']
+                    total_adjusted_cost += result['adjusted_total_cost_pounds']
+                    total_runtime += result['runtime_seconds']
+                    
+                    # Key metrics, emitted as one write per scenario
+                    lines = [
+                        f"  ⚡ Feed-in Priority: {result['feed_in_priority_hours']:.1f}h",
+                        f"  💰 Raw Cost: £{result['total_cost_pounds']:.2f}",
+                        f"  🔋 Battery Value: £{result['battery_value_start_pounds']:.2f} → £{result['battery_value_end_pounds']:.2f} ({result['battery_value_change_pounds']:+.2f})",
+                        f"  💷 Adjusted Cost: £{result['adjusted_total_cost_pounds']:.2f}",
+                        f"  🔋 SOC: {result['battery_start_soc']:.0f}% → {result['battery_end_soc']:.0f}%",
+                    ]
+                    
+                    # Validation
+                    if result['validation']['passed']:
+                        lines.append("  ✅ PASS")
+                        passed += 1
+                    else:
+                        lines.append("  ❌ FAIL")
+                        lines.extend(f"     - {failure}" for failure in result['validation']['failures'])
+                        failed += 1
+                    print("\n".join(lines))
+                    
+                except Exception as e:
+                    print(f"  ❌ ERROR: {e}")
+                    import traceback
+                    traceback.print_exc()
                     failed += 1
-                
-            except Exception as e:
-                print(f"  ❌ ERROR: {e}")
-                import traceback
-                traceback.print_exc()
-                failed += 1
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
         
         # Summary
         print("\n" + "="*70)
@@ -471,15 +523,12 @@ class ScenarioRunner:
         print(f"Passed: {passed} ({passed/len(scenarios)*100:.1f}%)")
         print(f"Failed: {failed} ({failed/len(scenarios)*100:.1f}%)")
         
-        total_raw_cost = sum(r['total_cost_pounds'] for r in results)
-        total_adjusted_cost = sum(r['adjusted_total_cost_pounds'] for r in results)
         avg_adjusted_cost = total_adjusted_cost / len(results) if results else 0
         
         print(f"\nTotal Raw Cost: £{total_raw_cost:.2f}")
         print(f"Total Adjusted Cost: £{total_adjusted_cost:.2f} (accounting for battery value)")
         print(f"Average Adjusted Cost: £{avg_adjusted_cost:.2f}/scenario")
         
-        total_runtime = sum(r['runtime_seconds'] for r in results)
         avg_runtime = total_runtime / len(results) if results else 0
         print(f"\nTotal Runtime: {total_runtime:.2f}s")
         print(f"Average Runtime: {avg_runtime:.3f}s/scenario")
@@ -505,11 +554,58 @@ class ScenarioRunner:
         
         with open(results_file, 'w') as f:
             json.dump(summary, f, indent=2)
+        self._append_index(os.path.basename(results_file))
         
         print(f"\n📄 Results saved: {results_file}")
         print("="*70 + "\n")
         
         return summary
+    
+    def _append_index(self, filename: str):
+        """Record a saved results file in the run index (see compare.py)"""
+        line = (json.dumps({'file': filename}) + '\n').encode('utf-8')
+        with open(os.path.join(self.results_dir, RESULTS_INDEX), 'ab+') as f:
+            # Start a fresh line if an interrupted run left a partial one
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+    
+    def prune_results(self, keep: int) -> int:
+        """
+        Delete all but the newest `keep` results_*.json files.
+        
+        The timestamp in the filename sorts chronologically, so no stat()
+        calls are needed. Returns the number of files removed.
+        """
+        files = sorted(
+            name for name in os.listdir(self.results_dir)
+            if name.startswith('results_') and name.endswith('.json')
+        )
+        stale = files[:-keep] if keep > 0 else files
+        for name in stale:
+            os.unlink(os.path.join(self.results_dir, name))
+        
+        # Drop the removed files (and any damaged lines) from the run index,
+        # swapping the new index in atomically
+        index_path = os.path.join(self.results_dir, RESULTS_INDEX)
+        if stale and os.path.exists(index_path):
+            removed = set(stale)
+            lines = []
+            with open(index_path, 'r') as f:
+                for line in f:
+                    try:
+                        name = json.loads(line)['file']
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if name not in removed:
+                        lines.append(line)
+            tmp_path = index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.writelines(lines)
+            os.replace(tmp_path, index_path)
+        return len(stale)
 
 
 def main():
@@ -525,13 +621,21 @@ def main():
     parser.add_argument('--planner', choices=['rule-based', 'ml', 'lp'],
                        default='rule-based',
                        help='Planner type: rule-based (default), ml (machine learning), lp (linear programming)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of processes to run scenarios in (default 1)')
+    parser.add_argument('--keep', type=int,
+                       help='After the run, delete all but the N newest results files')
     
     args = parser.parse_args()
     
     runner = ScenarioRunner(args.scenarios_dir, args.results_dir, args.planner)
     
     try:
-        runner.run_all(args.category)
+        runner.run_all(args.category, workers=args.workers)
+        if args.keep is not None:
+            removed = runner.prune_results(args.keep)
+            if removed:
+                print(f"🗑️  Removed {removed} old results file(s)")
     except KeyboardInterrupt:
         print("\n\n⚠️  Test run interrupted")
     except Exception as e:
@@ -0,0 +1,94 @@
+"""
+Results Index Test Script
+
+Checks the run index (index.jsonl) that runner.py appends to and compare.py
+reads to find the latest results: damaged lines - e.g. a half-written line
+from an interrupted run - must be skipped, not break the lookup.
+
+Usage:
+    python test_results_index.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from compare import ResultsComparator, RESULTS_INDEX
+from runner import ScenarioRunner
+
+
+def make_results_dir(names, index_lines):
+    """A results dir holding empty results files and the given index lines"""
+    results_dir = tempfile.mkdtemp()
+    for name in names:
+        with open(os.path.join(results_dir, name), 'w') as f:
+            json.dump({'results': []}, f)
+    with open(os.path.join(results_dir, RESULTS_INDEX), 'w') as f:
+        f.write(''.join(index_lines))
+    return results_dir
+
+
+def entry(name):
+    return json.dumps({'file': name}) + '\n'
+
+
+def test_damaged_index_lines_skipped():
+    """The latest-results lookup skips lines that aren't valid entries"""
+    names = ['results_20260101_100000.json', 'results_20260102_100000.json', 'results_20260103_100000.json']
+    results_dir = make_results_dir(names, [
+        entry(names[0]),
+        '{"file": "results_2026\n',   # Truncated by an interrupted run
+        entry(names[1]),
+        '[1, 2]\n',                   # Valid JSON, not an entry
+        '\n',
+        entry(names[2]),
+        '{"fil',                      # Partial last line
+    ])
+
+    latest = ResultsComparator(results_dir).get_latest_results(2)
+    assert latest == [names[2], names[1]], latest
+
+    print("✅ Damaged index lines skipped")
+
+
+def test_append_after_partial_line():
+    """A new entry after a partial last line lands on its own line"""
+    names = ['results_20260101_100000.json', 'results_20260102_100000.json']
+    results_dir = make_results_dir(names, [entry(names[0]), '{"fil'])
+
+    runner = ScenarioRunner.__new__(ScenarioRunner)  # No planner needed to append
+    runner.results_dir = results_dir
+    runner._append_index(names[1])
+
+    with open(os.path.join(results_dir, RESULTS_INDEX)) as f:
+        assert f.read().splitlines()[-1] == entry(names[1]).strip()
+    assert ResultsComparator(results_dir).get_latest_results(2) == [names[1], names[0]]
+
+    print("✅ Append after a partial line starts a new line")
+
+
+def test_prune_drops_removed_and_damaged_lines():
+    """Pruning rewrites the index without the deleted files or bad lines"""
+    names = [f'results_2026010{day}_100000.json' for day in range(1, 5)]
+    results_dir = make_results_dir(names, [entry(names[0]), 'not json\n'] + [entry(n) for n in names[1:]])
+
+    runner = ScenarioRunner.__new__(ScenarioRunner)
+    runner.results_dir = results_dir
+    assert runner.prune_results(keep=2) == 2
+
+    with open(os.path.join(results_dir, RESULTS_INDEX)) as f:
+        assert f.read() == entry(names[2]) + entry(names[3])
+    assert not os.path.exists(os.path.join(results_dir, RESULTS_INDEX + '.tmp'))
+
+    print("✅ Prune drops removed files and damaged lines from the index")
+
+
+if __name__ == '__main__':
+    test_damaged_index_lines_skipped()
+    test_append_after_partial_line()
+    test_prune_drops_removed_and_damaged_lines()
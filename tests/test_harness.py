@@ -13,16 +13,42 @@ Usage:
 import os
 import sys
 import json
+import re
+import importlib.util
+import threading
+import traceback
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, time, timedelta
+from time import monotonic, sleep
 from typing import Dict, Optional, Any
 
 # Ensure repo root is on the path (works whether run from tests/ or repo root)
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
-if os.path.join(REPO_ROOT, 'apps', 'solar_optimizer') not in sys.path:
-    sys.path.insert(0, os.path.join(REPO_ROOT, 'apps', 'solar_optimizer'))
+for _path in (os.path.join(REPO_ROOT, 'apps'), os.path.join(REPO_ROOT, 'apps', 'solar_optimizer')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# Modules loaded by file path, so each .py file is only executed once per run
+_MODULE_CACHE = {}
+
+
+def _load_module(name: str, path: str):
+    """Load a module from a repo-relative path, reusing it on later calls"""
+    module = _MODULE_CACHE.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_ROOT, path))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[name] = module
+        _MODULE_CACHE[name] = module
+    return module
 
 # Try to load dotenv, but don't fail if not installed yet
 try:
@@ -32,6 +58,64 @@ except ImportError:
     print("⚠️  python-dotenv not installed. Install with: pip install python-dotenv requests")
     print("Or set environment variables manually")
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+
+def _json_body(payload) -> bytes:
+    """Serialise a request body, with orjson when it's installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _json_text(payload) -> str:
+    """Serialise data for embedding in the plan page's <script> block."""
+    return _json_body(payload).decode('utf-8')
+
+# Connection attempts at start-up (1s, 2s, 4s backoff between them) so a
+# Home Assistant restart doesn't abort the whole run
+CONNECT_ATTEMPTS = 4
+
+# How long (seconds) a snapshot of all entity states is reused for reads
+STATES_TTL = 5.0
+
+# Failures a states refresh rides out by serving the last good snapshot
+STATES_FETCH_ERRORS = (requests.exceptions.RequestException, ValueError) + ((ijson.JSONError,) if HAS_IJSON else ())
+
+# How long (seconds) set_state writes are buffered before being sent
+WRITE_BEHIND_DELAY = 0.1
+
+ENTITY_ID_RE = re.compile(r'^[a-z_]+\.[a-z0-9_]+$')
+
+# get_value()'s "is this an entity reference" test ('binary_sensor.' is
+# covered by 'sensor.')
+ENTITY_REF_RE = re.compile(r'sensor\.|number\.|switch\.')
+
+
+@lru_cache(maxsize=512)
+def _is_entity_ref(value: str) -> bool:
+    """True if a config value names an entity rather than a literal"""
+    return ENTITY_REF_RE.search(value) is not None
+
+# Entity discovery patterns, compiled once rather than re-scanned per entity.
+# Plain substring tests screen out most entities before these run.
+OCTOPUS_RE = re.compile(r'octopus_energy_electricity.*_(current_rate|current_day_rates)$')
+SOLIS_POWER_RE = re.compile(r'pv_power|measured_power|house_load')
+SOLIS_SLOT_RE = re.compile(r'timed_(?:dis)?charge')
+
+# {{name}} placeholders in templates/plan.html
+TEMPLATE_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
 
 class HomeAssistantAPI:
     """
@@ -55,15 +139,48 @@ class HomeAssistantAPI:
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
         }
-        
-        # Test connection
+        # One keep-alive session for every REST call, so the harness's many
+        # reads don't each pay for a new TCP (and TLS) connection. The
+        # background load forecast shares it: plain GET/POSTs only touch the
+        # adapter's connection pool, which is thread-safe, and the session's
+        # headers and adapters aren't changed after this point.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Snapshot of /api/states, keyed by entity_id (see _refresh_states)
+        self._states_cache = {}
+        self._cache_ts = 0.0
+        self._states_failing = False  # Only the first failure of a streak is reported
+        self._states_lock = threading.Lock()  # Serialises refresh and swap across threads
+        
+        # Write-behind buffer for set_state (see flush)
+        self._pending_writes = {}
+        self._flush_timer = None
+        self._write_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Held while a flush is POSTing
+        
+        # Test connection, riding out a short HA restart with backoff
         print(f"🔌 Connecting to {url}...")
         try:
-            response = requests.get(f'{self.url}/api/', headers=self.headers, timeout=10)
+            for attempt in range(CONNECT_ATTEMPTS):
+                try:
+                    response = self.session.get(f'{self.url}/api/', timeout=10)
+                    break
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    if attempt == CONNECT_ATTEMPTS - 1:
+                        raise requests.exceptions.ConnectionError(
+                            f"no response after {CONNECT_ATTEMPTS} attempts: {e}") from e
+                    delay = 2 ** attempt
+                    print(f"   ⏳ Home Assistant not reachable, retrying in {delay}s...")
+                    sleep(delay)
             response.raise_for_status()
             print(f"✅ Connected to Home Assistant!")
-        except requests.exceptions.ConnectionError:
-            print(f"❌ Cannot connect to {url}")
+        except requests.exceptions.ConnectionError as e:
+            print(f"❌ Cannot connect to {url} ({e})")
             print(f"   Check:")
             print(f"   - Is Home Assistant running?")
             print(f"   - Is the URL correct? (include http:// and port)")
@@ -79,49 +196,75 @@ class HomeAssistantAPI:
             print(f"❌ Failed to connect: {e}")
             sys.exit(1)
     
+    def _refresh_states(self, ttl: float = STATES_TTL):
+        """
+        Refresh the local snapshot of every entity if it is older than ttl.
+        
+        One /api/states call replaces the per-entity GETs that get_value()
+        and the providers would otherwise make one after another.
+        """
+        self.flush()  # Read our own writes
+        # The background load forecast reads at the same time as the main
+        # thread; one refresh at a time, and readers only ever see a complete
+        # snapshot dict
+        with self._states_lock:
+            if self._states_cache and monotonic() - self._cache_ts <= ttl:
+                return
+            try:
+                with self.session.get(f'{self.url}/api/states', timeout=10, stream=True) as response:
+                    response.raise_for_status()
+                    if HAS_IJSON:
+                        # Parse states as they arrive, so a large install never
+                        # holds the whole body and a full list alongside the dict
+                        response.raw.decode_content = True
+                        states = ijson.items(response.raw, 'item', use_float=True)
+                    elif HAS_ORJSON:
+                        states = orjson.loads(response.content)
+                    else:
+                        states = response.json()
+                    self._states_cache = {state['entity_id']: state for state in states}
+                self._cache_ts = monotonic()
+                if self._states_failing:
+                    print("✅ Entity states refreshed again")
+                    self._states_failing = False
+            except STATES_FETCH_ERRORS as e:
+                # Keep serving the last good snapshot; the unchanged timestamp
+                # means the next read tries the fetch again
+                if not self._states_failing:
+                    print(f"⚠️  Could not refresh entity states, using the last snapshot: {e}")
+                    self._states_failing = True
+    
     def get_state(self, entity_id: str, attribute: Optional[str] = None, default: Any = None):
         """Get entity state (compatible with hassapi)"""
-        try:
-            response = requests.get(
-                f'{self.url}/api/states/{entity_id}',
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 404:
-                return default
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if attribute == "all":
-                return data
-            elif attribute:
-                return data.get('attributes', {}).get(attribute, default)
-            else:
-                state = data.get('state')
-                if state in ['unknown', 'unavailable']:
-                    return default
-                return state
-                
-        except Exception as e:
+        self._refresh_states()
+        data = self._states_cache.get(entity_id)
+        if data is None:
             return default
+        
+        if attribute == "all":
+            return data
+        elif attribute:
+            return data.get('attributes', {}).get(attribute, default)
+        else:
+            state = data.get('state')
+            if state in ['unknown', 'unavailable']:
+                return default
+            return state
+    
+    def get_states_bulk(self, entity_ids):
+        """
+        Fetch several entities in one request - returns dict of entity_id: state.
+        
+        HA's REST API has no server-side entity filter for /api/states, so
+        this loads (or reuses) the snapshot once and picks the ids out of it.
+        """
+        self._refresh_states()
+        return {e: self._states_cache[e] for e in entity_ids if e in self._states_cache}
     
     def get_all_states(self):
         """Get all entity states - returns dict of entity_id: state"""
-        try:
-            response = requests.get(
-                f'{self.url}/api/states',
-                headers=self.headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            all_states = response.json()
-            
-            # Return as dict with entity_id as key
-            return {state['entity_id']: state for state in all_states}
-        except Exception as e:
-            return {}
+        self._refresh_states()
+        return self._states_cache
     
     def get_value(self, value_or_entity: Any, default=None) -> Any:
         """
@@ -131,11 +274,11 @@ class HomeAssistantAPI:
         if value_or_entity is None:
             return default
         
-        value_str = str(value_or_entity)
+        value_str = value_or_entity if isinstance(value_or_entity, str) else str(value_or_entity)
         
-        # If it looks like an entity ID, fetch from HA
-        if '.' in value_str and ('sensor.' in value_str or 'number.' in value_str or 
-                                  'binary_sensor.' in value_str or 'switch.' in value_str):
+        # If it looks like an entity ID, fetch from HA (config values repeat,
+        # so the decision is cached)
+        if _is_entity_ref(value_str):
             state = self.get_state(value_str, default)
             try:
                 return float(state) if state is not None else default
@@ -146,40 +289,75 @@ class HomeAssistantAPI:
         return value_or_entity
     
     def set_state(self, entity_id: str, state: Any, attributes: Optional[Dict] = None):
-        """Set entity state (for sensors we create)"""
-        try:
-            payload = {
-                'state': state,
-                'attributes': attributes or {}
-            }
+        """
+        Set entity state (for sensors we create).
+        
+        Writes are held for WRITE_BEHIND_DELAY seconds so repeated updates
+        to the same sensor collapse into one POST carrying the latest value.
+        """
+        with self._write_lock:
+            self._pending_writes[entity_id] = (state, attributes or {})
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(WRITE_BEHIND_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self):
+        """
+        POST any pending set_state writes now.
+        
+        Also waits for a flush already running on the timer thread, so once
+        this returns every earlier set_state has reached HA.
+        """
+        with self._flush_lock:
+            with self._write_lock:
+                pending, self._pending_writes = self._pending_writes, {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
             
-            response = requests.post(
-                f'{self.url}/api/states/{entity_id}',
-                headers=self.headers,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            for entity_id, (state, attributes) in pending.items():
+                try:
+                    response = self.session.post(
+                        f'{self.url}/api/states/{entity_id}',
+                        data=_json_body({'state': state, 'attributes': attributes}),
+                        timeout=10
+                    )
+                    response.raise_for_status()
+                except Exception as e:
+                    print(f"❌ Error setting state for {entity_id}: {e}")
             
-        except Exception as e:
-            print(f"❌ Error setting state for {entity_id}: {e}")
+            if pending:
+                # Next read sees the new states (after any refresh already
+                # in flight, which may predate these writes)
+                with self._states_lock:
+                    self._cache_ts = 0.0
     
     def call_service(self, service: str, **kwargs):
         """Call a service"""
+        # Keep the order the code issued things in: queued set_state writes
+        # go out before the service call
+        self.flush()
         try:
             domain, service_name = service.split('/')
             
-            response = requests.post(
+            response = self.session.post(
                 f'{self.url}/api/services/{domain}/{service_name}',
-                headers=self.headers,
-                json=kwargs,
+                data=_json_body(kwargs),
                 timeout=10
             )
             response.raise_for_status()
+            with self._states_lock:
+                self._cache_ts = 0.0  # Services can change entity states
             
         except Exception as e:
             print(f"❌ Error calling service {service}: {e}")
     
+    def close(self):
+        """Send any pending writes and release the pooled HTTP connections"""
+        self.flush()
+        self.session.close()
+    
     def log(self, message: str, level: str = "INFO"):
         """Log a message"""
         timestamp = datetime.now().strftime('%H:%M:%S')
@@ -206,10 +384,19 @@ def load_config_from_env() -> Dict:
     """
     Load configuration from environment variables or .env file.
     
+    The environment doesn't change during a run, so the values are read
+    once; each call gets its own copy, free for the caller to modify.
+    
     Create a .env file with (minimum):
         HA_URL=http://192.168.1.100:8123
         HA_TOKEN=your_long_lived_access_token_here
     """
+    return dict(_read_config_from_env())
+
+
+@lru_cache(maxsize=1)
+def _read_config_from_env() -> Dict:
+    """Build the config dict from the environment (cached - copy before use)"""
     config = {
         'ha_url': os.getenv('HA_URL'),
         'ha_token': os.getenv('HA_TOKEN'),
@@ -265,117 +452,127 @@ def load_config_from_env() -> Dict:
     return config
 
 
-def find_octopus_agile_entities(hass):
-    """Auto-discover Octopus Agile entities by pattern matching"""
-    print("\n🔍 Searching for Octopus Agile entities...")
+def config_entity_ids(config: Dict) -> list:
+    """Return the config values that are entity ids (e.g. 'sensor.x', 'number.y')"""
+    return [v for v in config.values() if isinstance(v, str) and ENTITY_ID_RE.match(v)]
+
+
+@dataclass
+class HarnessContext:
+    """
+    Connection, config and providers shared by every test in one run.
     
-    try:
-        # Get all states
-        response = requests.get(
-            f'{hass.url}/api/states',
-            headers=hass.headers,
-            timeout=10
-        )
-        response.raise_for_status()
-        all_entities = response.json()
-        
-        # Search for Octopus patterns
-        current_rate = None
-        rates_event = None
-        export_rate = None
-        
-        for entity in all_entities:
-            entity_id = entity.get('entity_id', '')
-            
-            # Find current rate sensor (ends with _current_rate)
-            if 'octopus_energy_electricity' in entity_id and entity_id.endswith('_current_rate'):
-                if 'export' not in entity_id:
-                    current_rate = entity_id
-                    print(f"  ✅ Found import rate: {entity_id}")
-                else:
-                    export_rate = entity_id
-                    print(f"  ✅ Found export rate: {entity_id}")
-            
-            # Find rates event (ends with _current_day_rates)
-            if 'octopus_energy_electricity' in entity_id and entity_id.endswith('_current_day_rates'):
-                if 'export' not in entity_id:
-                    rates_event = entity_id
-                    print(f"  ✅ Found rates event: {entity_id}")
-        
-        return {
-            'current_rate': current_rate,
-            'rates_event': rates_event,
-            'export_rate': export_rate
-        }
-        
-    except Exception as e:
-        print(f"  ⚠️  Error searching: {e}")
-        return None
+    The pricing provider and inverter interface are built and set up on
+    first use, so their auto-discovery runs once rather than per test.
+    """
+    hass: HomeAssistantAPI
+    config: Dict
+    pricing: Any = None
+    pricing_ready: bool = False
+    inverter: Any = None
+    inverter_ready: bool = False
+    
+    def get_pricing(self):
+        """Import pricing provider, set up with auto-discovery"""
+        if self.pricing is None:
+            _load_module("pricing_provider_base", "apps/solar_optimizer/pricing_provider_base.py")
+            _load_module("base_provider", "apps/solar_optimizer/providers/base_provider.py")
+            module = _load_module("import_pricing_provider", "apps/solar_optimizer/providers/import_pricing_provider.py")
+            self.pricing = module.ImportPricingProvider(self.hass)
+            self.pricing_ready = self.pricing.setup({})
+        return self.pricing
+    
+    def get_inverter(self):
+        """Solis S6 inverter interface, set up from the loaded config"""
+        if self.inverter is None:
+            _load_module("inverter_interface_base", "apps/solar_optimizer/inverter_interface_base.py")
+            module = _load_module("inverter_interface_solis6", "apps/solar_optimizer/inverter_interface_solis6.py")
+            self.inverter = module.SolisInverterInterface(self.hass)
+            self.inverter_ready = self.inverter.setup(self.config)
+        return self.inverter
 
 
-def find_solis_entities(hass):
-    """Auto-discover Solis/Solax entities by pattern matching"""
-    print("\n🔍 Searching for Solis inverter entities...")
+def discover_entities(hass):
+    """
+    Auto-discover Octopus Agile and Solis/Solax entities by pattern matching.
     
-    try:
-        response = requests.get(
-            f'{hass.url}/api/states',
-            headers=hass.headers,
-            timeout=10
-        )
-        response.raise_for_status()
-        all_entities = response.json()
-        
-        found = {
-            'battery': [],
-            'power': [],
-            'slots': []
-        }
-        
-        for entity in all_entities:
-            entity_id = entity.get('entity_id', '')
-            
-            # Battery sensors
-            if any(x in entity_id for x in ['solis', 'solax']):
-                if 'battery' in entity_id:
-                    found['battery'].append(entity_id)
-                elif any(x in entity_id for x in ['pv_power', 'measured_power', 'house_load']):
-                    found['power'].append(entity_id)
-                elif 'timed_charge' in entity_id or 'timed_discharge' in entity_id:
-                    found['slots'].append(entity_id)
-        
-        # Display findings
-        if found['battery']:
-            print(f"\n  📊 Battery sensors ({len(found['battery'])} found):")
-            for e in found['battery'][:5]:  # Show first 5
-                print(f"    • {e}")
-        
-        if found['power']:
-            print(f"\n  ⚡ Power sensors ({len(found['power'])} found):")
-            for e in found['power'][:5]:
-                print(f"    • {e}")
-        
-        if found['slots']:
-            print(f"\n  🕐 Time slot entities ({len(found['slots'])} found):")
-            for e in found['slots'][:8]:
-                print(f"    • {e}")
-        
-        return found
-        
-    except Exception as e:
-        print(f"  ⚠️  Error searching: {e}")
-        return None
+    Both searches classify the same entity list, so they share one
+    snapshot and one pass over it.
+    
+    Returns:
+        (octopus, solis) - dicts of discovered entity ids
+    """
+    print("\n🔍 Searching for Octopus Agile and Solis inverter entities...")
+    
+    octopus = {
+        'current_rate': None,
+        'rates_event': None,
+        'export_rate': None
+    }
+    solis = {
+        'battery': [],
+        'power': [],
+        'slots': []
+    }
+    
+    for entity_id in hass.get_all_states():
+        # Octopus: current rate sensors and the rates event
+        m = 'octopus_energy' in entity_id and OCTOPUS_RE.search(entity_id)
+        if m:
+            is_export = 'export' in entity_id
+            if m.group(1) == 'current_rate':
+                octopus['export_rate' if is_export else 'current_rate'] = entity_id
+            elif not is_export:
+                octopus['rates_event'] = entity_id
+        
+        # Solis/Solax: battery, power and timed slot entities
+        if 'solis' in entity_id or 'solax' in entity_id:
+            if 'battery' in entity_id:
+                solis['battery'].append(entity_id)
+            elif SOLIS_POWER_RE.search(entity_id):
+                solis['power'].append(entity_id)
+            elif SOLIS_SLOT_RE.search(entity_id):
+                solis['slots'].append(entity_id)
+    
+    # Display findings
+    if octopus['current_rate']:
+        print(f"  ✅ Found import rate: {octopus['current_rate']}")
+    if octopus['export_rate']:
+        print(f"  ✅ Found export rate: {octopus['export_rate']}")
+    if octopus['rates_event']:
+        print(f"  ✅ Found rates event: {octopus['rates_event']}")
+    
+    if solis['battery']:
+        print(f"\n  📊 Battery sensors ({len(solis['battery'])} found):")
+        for e in solis['battery'][:5]:  # Show first 5
+            print(f"    • {e}")
+    
+    if solis['power']:
+        print(f"\n  ⚡ Power sensors ({len(solis['power'])} found):")
+        for e in solis['power'][:5]:
+            print(f"    • {e}")
+    
+    if solis['slots']:
+        print(f"\n  🕐 Time slot entities ({len(solis['slots'])} found):")
+        for e in solis['slots'][:8]:
+            print(f"    • {e}")
+    
+    return octopus, solis
 
 
-def test_connection():
+def test_connection(config: Dict):
     """Test basic connection to Home Assistant"""
     print("\n" + "=" * 60)
     print("Test 1: Connection Test")
     print("=" * 60)
     
-    config = load_config_from_env()
     hass = HomeAssistantAPI(config['ha_url'], config['ha_token'])
     
+    # Load every configured sensor in one request; later reads hit the snapshot
+    entity_ids = config_entity_ids(config)
+    found = hass.get_states_bulk(entity_ids)
+    print(f"📋 {len(found)}/{len(entity_ids)} configured entities found")
+    
     print("✅ Connection test passed!")
     return hass
 
@@ -386,9 +583,8 @@ def test_read_entities(hass):
     print("Test 2: Auto-Discovery")
     print("=" * 60)
     
-    # Auto-discover Octopus Agile
-    print("\n🔍 Searching for Octopus Agile entities...")
-    octopus = find_octopus_agile_entities(hass)
+    # Auto-discover Octopus Agile and Solis entities in one pass
+    octopus, solis = discover_entities(hass)
     
     if octopus and octopus['current_rate']:
         price = hass.get_state(octopus['current_rate'])
@@ -403,10 +599,6 @@ def test_read_entities(hass):
         print(f"💰 Current Export Price: {export_price}p/kWh")
         print(f"   Entity: {octopus['export_rate']}")
     
-    # Auto-discover Solis entities
-    print("\n🔍 Searching for Solis/Solax entities...")
-    solis = find_solis_entities(hass)
-    
     if solis and solis['battery']:
         print(f"\n📊 Found {len(solis['battery'])} battery sensors")
         print(f"⚡ Found {len(solis['power'])} power sensors")
@@ -414,9 +606,10 @@ def test_read_entities(hass):
         
         # Show some current values
         print("\n📈 Current readings:")
-        for entity in solis['battery'][:3]:
-            value = hass.get_state(entity)
-            if value:
+        readings = hass.get_states_bulk(solis['battery'][:3])
+        for entity, data in readings.items():
+            value = data.get('state')
+            if value and value not in ('unknown', 'unavailable'):
                 print(f"  {entity} = {value}")
     else:
         print("\n⚠️  No Solis entities found")
@@ -425,47 +618,17 @@ def test_read_entities(hass):
     return True
 
 
-def test_pricing_provider(hass):
+def test_pricing_provider(ctx: HarnessContext):
     """Test the Octopus Agile pricing provider with auto-discovery"""
     print("\n" + "=" * 60)
     print("Test: Octopus Agile Pricing Provider")
     print("=" * 60)
     
-    # Add apps directory to path
-    import sys
-    import importlib.util
-    
-    sys.path.insert(0, os.path.join(REPO_ROOT, 'apps', 'solar_optimizer'))
-    
     try:
-        # Load modules directly to avoid relative import issues
-        
-        # Load base class first
-        spec_base = importlib.util.spec_from_file_location(
-            "pricing_provider_base", 
-            "./apps/solar_optimizer/pricing_provider_base.py"
-        )
-        base_module = importlib.util.module_from_spec(spec_base)
-        spec_base.loader.exec_module(base_module)
-        sys.modules['pricing_provider_base'] = base_module
-        
-        # Load import pricing provider (v2.3)
-        spec_octopus = importlib.util.spec_from_file_location(
-            "import_pricing_provider",
-            "apps/solar_optimizer/providers/import_pricing_provider.py"
-        )
-        octopus_module = importlib.util.module_from_spec(spec_octopus)
-        spec_octopus.loader.exec_module(octopus_module)
+        # Create provider (empty config - let it auto-discover)
+        pricing = ctx.get_pricing()
         
-        ImportPricingProvider = octopus_module.ImportPricingProvider
-        
-        # Create provider
-        pricing = ImportPricingProvider(hass)
-        
-        # Setup with empty config - let it auto-discover
-        success = pricing.setup({})
-        
-        if not success:
+        if not ctx.pricing_ready:
             print("❌ Pricing provider setup failed (auto-discovery didn't find entities)")
             print("   Make sure Octopus Energy integration is installed")
             return False
@@ -494,59 +657,30 @@ def test_pricing_provider(hass):
         # Show statistics
         stats = price_data['statistics']
         print(f"\n📈 Price Statistics:")
-        print(f"  Min: {stats['min']:.2f}p")
-        print(f"  Max: {stats['max']:.2f}p")
-        print(f"  Avg: {stats['avg']:.2f}p")
+        print(f"  Min: {stats['min']:.2f}p\n"
+              f"  Max: {stats['max']:.2f}p\n"
+              f"  Avg: {stats['avg']:.2f}p")
         
         print("\n✅ Pricing provider test complete")
         return True
         
     except Exception as e:
         print(f"❌ Error testing pricing provider: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
 
-def test_inverter_interface(hass):
+def test_inverter_interface(ctx: HarnessContext):
     """Test the Solis S6 inverter interface"""
     print("\n" + "=" * 60)
     print("Test: Solis S6 Inverter Interface")
     print("=" * 60)
     
-    import sys
-    import importlib.util
-    
-    sys.path.insert(0, os.path.join(REPO_ROOT, 'apps', 'solar_optimizer'))
-    
     try:
-        # Load base interface first
-        spec_base = importlib.util.spec_from_file_location(
-            "inverter_interface_base",
-            "./apps/solar_optimizer/inverter_interface_base.py"
-        )
-        base_module = importlib.util.module_from_spec(spec_base)
-        spec_base.loader.exec_module(base_module)
-        sys.modules['inverter_interface_base'] = base_module
-        
-        # Load Solis interface
-        spec_solis = importlib.util.spec_from_file_location(
-            "inverter_interface_solis6",
-            "./apps/solar_optimizer/inverter_interface_solis6.py"
-        )
-        solis_module = importlib.util.module_from_spec(spec_solis)
-        spec_solis.loader.exec_module(solis_module)
-        
-        SolisInverterInterface = solis_module.SolisInverterInterface
-        
-        # Create interface
-        interface = SolisInverterInterface(hass)
-        
-        # Setup with config
-        config = load_config_from_env()
-        success = interface.setup(config)
+        # Create interface, set up with config
+        interface = ctx.get_inverter()
         
-        if not success:
+        if not ctx.inverter_ready:
             print("❌ Interface setup failed")
             return False
         
@@ -570,7 +704,6 @@ def test_inverter_interface(hass):
         
     except Exception as e:
         print(f"❌ Error testing inverter: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -592,9 +725,12 @@ def main():
         print("\n   Then run: python test_harness.py")
         return
     
+    hass = None
     try:
         # Test 1: Connection
-        hass = test_connection()
+        config = load_config_from_env()
+        hass = test_connection(config)
+        ctx = HarnessContext(hass, config)
         
         # Test 2: Auto-discover with quick scan
         test_read_entities(hass)
@@ -603,10 +739,10 @@ def main():
         print("\n" + "=" * 60)
         print("Testing with actual provider code...")
         print("=" * 60)
-        test_pricing_provider(hass)
+        test_pricing_provider(ctx)
         
         # Test 4: Inverter interface (uses real code)
-        test_inverter_interface(hass)
+        test_inverter_interface(ctx)
         
         print("\n" + "=" * 70)
         print("  ✅ All tests complete!")
@@ -627,7 +763,7 @@ def main():
         
         if response in planner_map:
             planner_type = planner_map[response]
-            plan = run_planner_and_generate_plan(hass, planner_type)
+            plan = run_planner_and_generate_plan(ctx, planner_type)
             if plan:
                 start_web_server(plan)
         elif response != 'n':
@@ -640,28 +776,24 @@ def main():
         print("\n\n⚠️  Tests interrupted")
     except Exception as e:
         print(f"\n\n❌ Test failed: {e}")
-        import traceback
         traceback.print_exc()
+    finally:
+        if hass:
+            hass.close()
 
 
 
-def run_planner_and_generate_plan(hass, planner_type='rule-based'):
+def run_planner_and_generate_plan(ctx: HarnessContext, planner_type='rule-based'):
     """Run the actual planner and generate a 24-hour plan"""
     print("\n" + "=" * 60)
     print(f"Running Solar Optimizer Planner ({planner_type.upper()})")
     print("=" * 60)
     
-    import sys
-    import importlib.util
-    
     # Make sure we're in the right directory
     if not os.path.exists('./apps/solar_optimizer'):
         print("[ERROR] Please run from SolarBat-AI root directory")
         return None
     
-    sys.path.insert(0, os.path.join(REPO_ROOT, 'apps', 'solar_optimizer'))
-    sys.path.insert(0, os.path.join(REPO_ROOT, 'apps'))
-    
     try:
         # Use the new planner structure
         from apps.solar_optimizer.planners import RuleBasedPlanner, MLPlanner, LinearProgrammingPlanner
@@ -694,48 +826,31 @@ def run_planner_and_generate_plan(hass, planner_type='rule-based'):
         
         print(f"✅ {planner_type.upper()} planner loaded")
         
-        # Load providers - they now handle their own dependencies!
-        
-        # Load base provider
-        spec_base_prov = importlib.util.spec_from_file_location(
-            "base_provider",
-            "apps/solar_optimizer/providers/base_provider.py"
-        )
-        base_prov_module = importlib.util.module_from_spec(spec_base_prov)
-        spec_base_prov.loader.exec_module(base_prov_module)
-        sys.modules['base_provider'] = base_prov_module
-        
-        # Load import pricing provider (loads its own dependencies via dependency_loader)
-        spec_pricing = importlib.util.spec_from_file_location(
-            "import_pricing_provider",
-            "apps/solar_optimizer/providers/import_pricing_provider.py"
-        )
-        pricing_module = importlib.util.module_from_spec(spec_pricing)
-        spec_pricing.loader.exec_module(pricing_module)
+        # Providers are shared with the earlier tests - already set up
+        hass = ctx.hass
+        config = ctx.config
+        pricing = ctx.get_pricing()
+        inverter = ctx.get_inverter()
         
-        # Load inverter interface
-        spec_inv_base = importlib.util.spec_from_file_location(
-            "inverter_interface_base",
-            "./apps/solar_optimizer/inverter_interface_base.py"
-        )
-        inv_base_module = importlib.util.module_from_spec(spec_inv_base)
-        spec_inv_base.loader.exec_module(inv_base_module)
-        sys.modules['inverter_interface_base'] = inv_base_module
+        # Load the AI components
+        print("[PLAN] Loading AI load forecaster and cost optimizer...")
         
-        spec_inv = importlib.util.spec_from_file_location(
-            "inverter_interface_solis6",
-            "./apps/solar_optimizer/inverter_interface_solis6.py"
-        )
-        inv_module = importlib.util.module_from_spec(spec_inv)
-        spec_inv.loader.exec_module(inv_module)
+        # Load load forecaster (loads its own dependencies via dependency_loader)
+        load_module = _load_module("load_forecaster", "apps/solar_optimizer/load_forecaster.py")
         
-        # Create instances
-        pricing = pricing_module.ImportPricingProvider(hass)
-        pricing.setup({})
+        # Create load forecaster
+        load_forecaster = load_module.LoadForecaster(hass)
+        if not load_forecaster.setup(config):
+            print("[ERROR] Load forecaster setup failed")
+            return None
         
-        config = load_config_from_env()
-        inverter = inv_module.SolisInverterInterface(hass)
-        inverter.setup(config)
+        # The load forecast downloads days of HA history, the slowest fetch
+        # here, so run it in the background while prices, inverter state and
+        # the solar forecast are read
+        print("[PLAN] Predicting load for next 24 hours using AI...")
+        load_pool = ThreadPoolExecutor(max_workers=1)
+        load_future = load_pool.submit(load_forecaster.predict_loads_24h)
+        load_pool.shutdown(wait=False)
         
         # Get 24 hours of prices
         print("\n[PLAN] Getting pricing data...")
@@ -752,12 +867,7 @@ def run_planner_and_generate_plan(hass, planner_type='rule-based'):
         
         try:
             # Load SolarForecastProvider
-            spec_solar = importlib.util.spec_from_file_location(
-                "solar_forecast_provider",
-                "apps/solar_optimizer/providers/solar_forecast_provider.py"
-            )
-            solar_module = importlib.util.module_from_spec(spec_solar)
-            spec_solar.loader.exec_module(solar_module)
+            solar_module = _load_module("solar_forecast_provider", "apps/solar_optimizer/providers/solar_forecast_provider.py")
             
             # Create solar forecast provider
             solar_provider = solar_module.SolarForecastProvider(hass)
@@ -778,14 +888,13 @@ def run_planner_and_generate_plan(hass, planner_type='rule-based'):
             print(f"[PLAN] ✅ Loaded {len(solar_forecast)} solar forecast points")
             
             # Show first few for verification
-            solar_scaling = float(os.getenv('SOLAR_SCALING', '1.0'))
+            solar_scaling = solar_provider.solar_scaling
             print(f"[PLAN] Solar forecast sample (scaled {solar_scaling}x):")
             for i, sf in enumerate(solar_forecast[:6]):
                 print(f"       {sf['period_end'].strftime('%H:%M %d/%m')}: {sf['pv_estimate']:.2f}kW")
                 
         except Exception as e:
             print(f"[ERROR] Failed to load Solcast data: {e}")
-            import traceback
             traceback.print_exc()
             return None
         
@@ -793,12 +902,7 @@ def run_planner_and_generate_plan(hass, planner_type='rule-based'):
         print("[PLAN] Getting export pricing...")
         try:
             # Load ExportPricingProvider
-            spec_export = importlib.util.spec_from_file_location(
-                "export_pricing_provider",
-                "apps/solar_optimizer/providers/export_pricing_provider.py"
-            )
-            export_module = importlib.util.module_from_spec(spec_export)
-            spec_export.loader.exec_module(export_module)
+            export_module = _load_module("export_pricing_provider", "apps/solar_optimizer/providers/export_pricing_provider.py")
             
             # Create export pricing provider
             export_provider = export_module.ExportPricingProvider(hass)
@@ -814,30 +918,8 @@ def run_planner_and_generate_plan(hass, planner_type='rule-based'):
             export_price = 15.0
             print(f"[PLAN] Using default export price: {export_price}p/kWh")
         
-        # Load the AI components
-        print("[PLAN] Loading AI load forecaster and cost optimizer...")
-        
-        # Load load forecaster (loads its own dependencies via dependency_loader)
-        spec_load = importlib.util.spec_from_file_location(
-            "load_forecaster",
-            "./apps/solar_optimizer/load_forecaster.py"
-        )
-        load_module = importlib.util.module_from_spec(spec_load)
-        spec_load.loader.exec_module(load_module)
-        
-        # Load forecaster and other providers are already loaded above
-        # Just need to load/import plan_creator for compatibility
-        # (the planner variable is already set at the top of this function)
-        
-        # Create load forecaster
-        load_forecaster = load_module.LoadForecaster(hass)
-        if not load_forecaster.setup(config):
-            print("[ERROR] Load forecaster setup failed")
-            return None
-        
-        # Get load forecast
-        print("[PLAN] Predicting load for next 24 hours using AI...")
-        load_forecast = load_forecaster.predict_loads_24h()
+        # Collect the load forecast started above
+        load_forecast = load_future.result()
         
         # Prepare provider data format for plan creator
         import_prices = [{'time': p['start'], 'price': p['price'], 'is_predicted': p.get('is_predicted', False)} 
@@ -880,16 +962,16 @@ def run_planner_and_generate_plan(hass, planner_type='rule-based'):
             'total_cost': plan_steps[-1].get('cumulative_cost', 0) / 100 if plan_steps else 0.0  # In pounds
         }
         
-        print(f"\n[PLAN] Plan generated successfully!")
-        print(f"       Battery: {inv_state['battery_soc']:.1f}% ({inv_caps['battery_capacity']}kWh)")
-        print(f"       Prices: {price_data['hours_known']:.1f}h known, {price_data['hours_predicted']:.1f}h predicted")
-        print(f"       Price range: {price_data['statistics']['min']:.2f}p - {price_data['statistics']['max']:.2f}p")
+        stats = price_data['statistics']
+        print(f"\n[PLAN] Plan generated successfully!\n"
+              f"       Battery: {inv_state['battery_soc']:.1f}% ({inv_caps['battery_capacity']}kWh)\n"
+              f"       Prices: {price_data['hours_known']:.1f}h known, {price_data['hours_predicted']:.1f}h predicted\n"
+              f"       Price range: {stats['min']:.2f}p - {stats['max']:.2f}p")
         
         return plan_dict
         
     except Exception as e:
         print(f"[ERROR] Error running planner: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -936,14 +1018,19 @@ def simulate_plan(prices, solar_forecast, inv_state, inv_caps, export_price=15.0
     min_discharge_soc = 30  # Don't discharge below this
     max_charge_soc = 90  # Don't charge above this
     
-    for i, price in enumerate(prices[:48]):  # 24 hours
-        # Get solar for this slot
-        solar_pv = 0
-        if i < len(solar_forecast):
-            solar_pv = solar_forecast[i]['pv_estimate']
-        
-        import_price = price['price']
-        
+    # SOC changes that don't depend on the running SOC, worked out once up
+    # front so the loop below only picks a branch and carries the clamp
+    energy_charged = (max_charge_rate * 0.5) * 0.95  # 30 min at max rate, 95% efficiency
+    charge_delta = (energy_charged / battery_capacity) * 100
+    energy_discharged = (max_discharge_rate * 0.5) * 0.95
+    discharge_delta = -(energy_discharged / battery_capacity) * 100
+    house_delta = -((0.5 * 0.5) / battery_capacity * 100)  # 0.5kW average house load
+    
+    slots = prices[:48]  # 24 hours
+    solar_pvs = [solar_forecast[i]['pv_estimate'] if i < len(solar_forecast) else 0
+                 for i in range(len(slots))]
+    
+    for price, import_price, solar_pv in zip(slots, import_prices, solar_pvs):
         # Determine mode and simulate SOC change
         mode = 'Self Use'
         soc_change = 0
@@ -954,9 +1041,7 @@ def simulate_plan(prices, solar_forecast, inv_state, inv_caps, export_price=15.0
             # Cheap import - force charge from grid
             mode = 'Force Charge'
             action = f'Charging from grid ({import_price:.2f}p <= {cheap_import_threshold:.2f}p threshold)'
-            # Charge for 30 minutes at max rate
-            energy_charged = (max_charge_rate * 0.5) * 0.95  # 95% efficiency
-            soc_change = (energy_charged / battery_capacity) * 100
+            soc_change = charge_delta
             
         elif (export_price > import_price + min_profit_margin and 
               import_price >= expensive_import_threshold and 
@@ -965,9 +1050,7 @@ def simulate_plan(prices, solar_forecast, inv_state, inv_caps, export_price=15.0
             mode = 'Force Discharge'
             profit_margin = export_price - import_price
             action = f'Exporting to grid (earn {export_price:.2f}p vs pay {import_price:.2f}p = +{profit_margin:.2f}p profit)'
-            # Discharge for 30 minutes
-            energy_discharged = (max_discharge_rate * 0.5) * 0.95
-            soc_change = -(energy_discharged / battery_capacity) * 100
+            soc_change = discharge_delta
             
         else:
             # Normal self-use
@@ -982,7 +1065,7 @@ def simulate_plan(prices, solar_forecast, inv_state, inv_caps, export_price=15.0
             else:
                 # Slight discharge for house load (assume 0.5kW average)
                 action = 'Powering house from battery'
-                soc_change = -((0.5 * 0.5) / battery_capacity * 100)
+                soc_change = house_delta
         
         # Update SOC (clamp to 0-100%)
         new_soc = max(0, min(100, current_soc + soc_change))
@@ -1011,13 +1094,33 @@ def simulate_plan(prices, solar_forecast, inv_state, inv_caps, export_price=15.0
     return plan_steps
 
 
+@lru_cache(maxsize=1)
+def _load_templates():
+    """
+    Read and prebuild the plan page once per run.
+    
+    The CSS and JS are inlined in place of their <link>/<script src> tags and
+    the page is split at its {{name}} placeholders, so a render only joins
+    the literal pieces with the plan's values - no pass over the document.
+    
+    Returns a tuple of literal text and placeholder names, alternating
+    (names at the odd indexes).
+    """
+    contents = []
+    for name in ('plan.html', 'plan.css', 'plan.js'):
+        with open(os.path.join(REPO_ROOT, 'templates', name), 'r', encoding='utf-8') as f:
+            contents.append(f.read())
+    html_template, css_content, js_content = contents
+    html_template = html_template.replace('<link rel="stylesheet" href="plan.css">', f'<style>{css_content}</style>')
+    html_template = html_template.replace('<script src="plan.js"></script>', f'<script>{js_content}</script>')
+    return tuple(TEMPLATE_PLACEHOLDER_RE.split(html_template))
+
+
 def generate_plan_html(plan, accuracy_tracker=None):
     """Generate HTML visualization using the 4-tab template."""
     if not plan:
         return "<html><body><h1>Error: No plan generated</h1></body></html>"
     
-    import json
-    
     # Try to import helpers
     try:
         from apps.solar_optimizer.forecast_accuracy_tracker import (
@@ -1036,34 +1139,30 @@ def generate_plan_html(plan, accuracy_tracker=None):
     
     # Load templates
     try:
-        with open(os.path.join(REPO_ROOT, 'templates', 'plan.html'), 'r', encoding='utf-8') as f:
-            html_template = f.read()
-        with open(os.path.join(REPO_ROOT, 'templates', 'plan.css'), 'r', encoding='utf-8') as f:
-            css_content = f.read()
-        with open(os.path.join(REPO_ROOT, 'templates', 'plan.js'), 'r', encoding='utf-8') as f:
-            js_content = f.read()
+        template_parts = _load_templates()
     except FileNotFoundError:
         return "<html><body><h1>Error: Template files not found in ./templates/</h1></body></html>"
     
     # ── TAB 1: Plan (summary + table) ──
+    stats = plan['statistics']
     summary_stats = f"""
         <div class="stat-box"><div class="stat-label">Current SOC</div><div class="stat-value">{plan['battery_soc']:.1f}%</div></div>
         <div class="stat-box"><div class="stat-label">Battery Size</div><div class="stat-value">{plan['battery_capacity']:.1f} kWh</div></div>
-        <div class="stat-box"><div class="stat-label">Min Price</div><div class="stat-value">{plan['statistics']['min']:.2f}p</div></div>
-        <div class="stat-box"><div class="stat-label">Max Price</div><div class="stat-value">{plan['statistics']['max']:.2f}p</div></div>
-        <div class="stat-box"><div class="stat-label">Avg Price</div><div class="stat-value">{plan['statistics']['avg']:.2f}p</div></div>
+        <div class="stat-box"><div class="stat-label">Min Price</div><div class="stat-value">{stats['min']:.2f}p</div></div>
+        <div class="stat-box"><div class="stat-label">Max Price</div><div class="stat-value">{stats['max']:.2f}p</div></div>
+        <div class="stat-box"><div class="stat-label">Avg Price</div><div class="stat-value">{stats['avg']:.2f}p</div></div>
         <div class="stat-box"><div class="stat-label">Confidence</div><div class="stat-value">{plan['confidence'].upper()}</div></div>
         <div class="stat-box"><div class="stat-label">24h Cost</div><div class="stat-value">£{plan.get('total_cost', 0):.2f}</div></div>
     """
     
+    # Table rows and per-mode counts in one pass; rows are joined at the end
     mode_counts = {'Self Use': 0, 'Force Charge': 0, 'Force Discharge': 0, 'Feed-in Priority': 0}
+    rows = []
     for step in plan['plan_steps']:
         mode = step['mode']
         if mode in mode_counts:
             mode_counts[mode] += 1
-    
-    plan_rows = ""
-    for step in plan['plan_steps']:
+        
         mode_class = f"mode-{step['mode'].lower().replace(' ', '-')}"
         pred_marker = " *" if step.get('is_predicted_price', False) else ""
         slot_cost = step.get('cost', 0)
@@ -1072,7 +1171,7 @@ def generate_plan_html(plan, accuracy_tracker=None):
         cumulative_str = f"£{cumulative:.2f}" if cumulative >= 0 else f"-£{abs(cumulative):.2f}"
         mode_display = '⚡ Feed-in Priority' if step['mode'] == 'Feed-in Priority' else step['mode']
         
-        plan_rows += f"""<tr class="{mode_class}">
+        rows.append(f"""<tr class="{mode_class}">
             <td><strong>{step['time'].strftime('%H:%M')}</strong></td>
             <td><strong>{mode_display}</strong></td>
             <td>{step['action']}</td>
@@ -1082,7 +1181,8 @@ def generate_plan_html(plan, accuracy_tracker=None):
             <td>{step['export_price']:.2f}p</td>
             <td class="{cost_class}">{abs(slot_cost):.2f}p</td>
             <td><strong>{cumulative_str}</strong></td>
-        </tr>"""
+        </tr>""")
+    plan_rows = "".join(rows)
     
     info_summary = f"""
         <strong>Plan Summary:</strong><br>
@@ -1147,52 +1247,55 @@ def generate_plan_html(plan, accuracy_tracker=None):
         settings_parts = {'thresholds': '<p>Not available</p>', 'modes': '', 'sensors': '', 'info': ''}
         settings_data = {}
     
-    # ── Substitute all placeholders ──
-    html = html_template.replace('{{timestamp}}', plan['timestamp'].strftime('%Y-%m-%d %H:%M:%S'))
-    html = html.replace('{{summary_stats}}', summary_stats)
-    html = html.replace('{{plan_rows}}', plan_rows)
-    html = html.replace('{{info_summary}}', info_summary)
-    html = html.replace('{{chart_data}}', json.dumps({}))
-    html = html.replace('{{prediction_data}}', json.dumps(prediction_data))
-    html = html.replace('{{prediction_info}}', prediction_info)
-    html = html.replace('{{accuracy_data}}', json.dumps(accuracy_data))
-    html = html.replace('{{accuracy_metrics}}', accuracy_parts['metrics'])
-    html = html.replace('{{accuracy_rows}}', accuracy_parts['rows'])
-    html = html.replace('{{accuracy_info}}', accuracy_parts['info'])
-    html = html.replace('{{settings_thresholds}}', settings_parts['thresholds'])
-    html = html.replace('{{settings_modes}}', settings_parts['modes'])
-    html = html.replace('{{settings_sensors}}', settings_parts['sensors'])
-    html = html.replace('{{settings_info}}', settings_parts['info'])
-    html = html.replace('{{settings_data}}', json.dumps(settings_data))
-    
-    # Inline CSS and JS
-    html = html.replace('<link rel="stylesheet" href="plan.css">', f'<style>{css_content}</style>')
-    html = html.replace('<script src="plan.js"></script>', f'<script>{js_content}</script>')
-    
-    return html
+    # ── Fill the placeholders between the prebuilt template pieces ──
+    values = {
+        'timestamp': plan['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
+        'summary_stats': summary_stats,
+        'plan_rows': plan_rows,
+        'info_summary': info_summary,
+        'chart_data': _json_text({}),
+        'prediction_data': _json_text(prediction_data),
+        'prediction_info': prediction_info,
+        'accuracy_data': _json_text(accuracy_data),
+        'accuracy_metrics': accuracy_parts['metrics'],
+        'accuracy_rows': accuracy_parts['rows'],
+        'accuracy_info': accuracy_parts['info'],
+        'settings_thresholds': settings_parts['thresholds'],
+        'settings_modes': settings_parts['modes'],
+        'settings_sensors': settings_parts['sensors'],
+        'settings_info': settings_parts['info'],
+        'settings_data': _json_text(settings_data),
+    }
+    parts = list(template_parts)
+    for i in range(1, len(parts), 2):
+        parts[i] = values.get(parts[i], f"{{{{{parts[i]}}}}}")
+    
+    return ''.join(parts)
     """Generate HTML visualization of the plan"""
     if not plan:
         return "<html><body><h1>Error: No plan generated</h1></body></html>"
     
 def start_web_server(plan):
     """Start a simple web server to display the plan"""
-    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
     import webbrowser
     
-    html_content = generate_plan_html(plan)
+    # The page never changes while serving, so encode it once up front
+    html_bytes = generate_plan_html(plan).encode('utf-8')
     
     class PlanHandler(BaseHTTPRequestHandler):
         def do_GET(self):
             self.send_response(200)
             self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(html_bytes)))
             self.end_headers()
-            self.wfile.write(html_content.encode('utf-8'))
+            self.wfile.write(html_bytes)
         
         def log_message(self, format, *args):
             pass  # Suppress server logs
     
     port = 8765
-    server = HTTPServer(('localhost', port), PlanHandler)
+    server = ThreadingHTTPServer(('localhost', port), PlanHandler)
     
     print(f"\n[WEB] Starting web server at http://localhost:{port}")
     print(f"[WEB] Opening plan in your browser...")
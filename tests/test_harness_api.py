@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test the harness's HomeAssistantAPI against a local fake Home Assistant.
+
+set_state writes are buffered briefly (write-behind) so repeated updates
+collapse into one POST; they must still reach HA before anything that
+could observe them - a service call or a states read.
+"""
+
+import sys
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from time import sleep
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import test_harness
+from test_harness import HomeAssistantAPI
+
+
+class FakeHomeAssistant:
+    """Serves /api/, /api/states and POSTs, recording every request in order"""
+
+    def __init__(self):
+        self.requests = []
+        self.states = [{'entity_id': 'sensor.battery_soc', 'state': '55', 'attributes': {}}]
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                fake.requests.append(('GET', self.path, None))
+                self._send(fake.states if self.path == '/api/states' else {'message': 'API running.'})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                fake.requests.append(('POST', self.path, body))
+                self._send(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def paths(self, method='POST'):
+        return [path for m, path, _ in self.requests if m == method]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def connect():
+    """A fake HA plus a connected API, with the start-up GET cleared"""
+    fake = FakeHomeAssistant()
+    hass = HomeAssistantAPI(fake.url, 'token')
+    fake.requests.clear()
+    return fake, hass
+
+
+def test_repeated_writes_collapse():
+    """Several set_state calls to one sensor send only the latest value"""
+    fake, hass = connect()
+    try:
+        for value in (1, 2, 3):
+            hass.set_state('sensor.solar_optimizer_plan', value, {'n': value})
+        hass.flush()
+
+        posts = [(path, body) for m, path, body in fake.requests if m == 'POST']
+        assert posts == [('/api/states/sensor.solar_optimizer_plan', {'state': 3, 'attributes': {'n': 3}})], posts
+    finally:
+        hass.close()
+        fake.close()
+
+    print("✅ Repeated set_state writes collapse into one POST")
+
+
+def test_timer_sends_pending_writes():
+    """A write goes out on its own once the write-behind delay passes"""
+    fake, hass = connect()
+    try:
+        hass.set_state('sensor.solar_wastage_risk', 'low')
+        sleep(test_harness.WRITE_BEHIND_DELAY + 0.4)
+        assert fake.paths() == ['/api/states/sensor.solar_wastage_risk'], fake.requests
+    finally:
+        hass.close()
+        fake.close()
+
+    print("✅ Write-behind timer sends pending writes")
+
+
+def test_writes_go_before_service_calls_and_reads():
+    """Queued writes reach HA before a later service call or states read"""
+    fake, hass = connect()
+    try:
+        hass.set_state('sensor.solar_optimizer_plan', 'ready')
+        hass.call_service('select/select_option', entity_id='select.mode', option='Self Use')
+        assert fake.paths() == ['/api/states/sensor.solar_optimizer_plan',
+                                '/api/services/select/select_option'], fake.requests
+
+        fake.requests.clear()
+        hass.set_state('sensor.solar_wastage_risk', 'high')
+        assert hass.get_state('sensor.battery_soc') == '55'
+        assert [(m, path) for m, path, _ in fake.requests] == [
+            ('POST', '/api/states/sensor.solar_wastage_risk'),
+            ('GET', '/api/states'),
+        ], fake.requests
+    finally:
+        hass.close()
+        fake.close()
+
+    print("✅ Writes are sent before service calls and reads")
+
+
+if __name__ == '__main__':
+    test_repeated_writes_collapse()
+    test_timer_sends_pending_writes()
+    test_writes_go_before_service_calls_and_reads()
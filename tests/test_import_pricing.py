@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the import pricing provider's Octopus rate parsing.
+
+Rate 'start' timestamps are parsed once and memoized by string; the memo
+must give the same datetimes as parsing every time, and stay bounded.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apps.solar_optimizer.providers.import_pricing_provider import ImportPricingProvider
+
+
+class FakeHass:
+    """Just enough of hassapi.Hass to serve an Octopus rates event"""
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    def get_state(self, entity_id, attribute=None, default=None):
+        return {'state': 'ok', 'attributes': {'rates': self.rates}}
+
+    def log(self, message, level="INFO"):
+        pass
+
+
+def parse_directly(start):
+    """How rate starts were parsed before the memo"""
+    return datetime.fromisoformat(start.replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+def test_memoized_rate_starts_match_direct_parse():
+    """Known prices come out the same on a first and a repeated read"""
+    tomorrow = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    rates = []
+    for i in range(48):
+        start = tomorrow + timedelta(minutes=30 * i)
+        # Octopus sends UTC with 'Z'; an explicit offset must be dropped the same way
+        suffix = 'Z' if i % 2 else '+01:00'
+        rates.append({'start': start.isoformat() + suffix, 'value_inc_vat': 0.2 + i / 1000})
+
+    provider = ImportPricingProvider(FakeHass(rates))
+    provider.rates_event = 'event.octopus_energy_electricity_x_current_day_rates'
+
+    first = provider.get_known_prices()
+    second = provider.get_known_prices()
+
+    assert [p['start'] for p in first] == sorted(parse_directly(r['start']) for r in rates)
+    assert first == second, "a repeated read gave different prices"
+
+    print("✅ Memoized rate starts match a direct parse")
+
+
+def test_rate_start_cache_stays_bounded():
+    """The memo is cleared once it grows past its limit, and stays correct"""
+    provider = ImportPricingProvider(FakeHass([]))
+    start = datetime(2026, 1, 1)
+
+    for i in range(2500):
+        text = (start + timedelta(minutes=30 * i)).isoformat() + 'Z'
+        assert provider._parse_rate_start(text) == parse_directly(text)
+        assert len(provider._rate_start_cache) <= 1001
+
+    print("✅ Rate start cache stays bounded")
+
+
+if __name__ == '__main__':
+    test_memoized_rate_starts_match_direct_parse()
+    test_rate_start_cache_stays_bounded()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the LP planner's model formulation.
+
+The battery discharge variable is modelled on the AC side (what reaches the
+house/grid after losses) rather than the battery side, and the starting SOC
+is a constant rather than a pinned variable. Both are pure reformulations,
+so plans must cost exactly what the original formulation found.
+"""
+
+import sys
+import math
+import io
+import contextlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apps.solar_optimizer.planners import LinearProgrammingPlanner
+
+
+# (start, peak solar kW, starting SOC %, capacity kWh, charge/discharge kW,
+#  export p/kWh, objective £ from the battery-side formulation)
+SCENARIOS = [
+    (datetime(2026, 1, 15, 0, 0), 0.0, 30.0, 10.0, 3.0, 15.0, -1.3768),
+    (datetime(2026, 6, 21, 6, 0), 8.0, 55.0, 10.0, 3.0, 15.0, -9.8470),
+    (datetime(2026, 6, 21, 16, 30), 14.0, 80.0, 32.0, 8.0, 22.0, -30.4774),
+    (datetime(2026, 3, 10, 12, 0), 4.0, 15.0, 32.0, 5.0, 4.1, -1.0260),
+]
+
+
+def create_inputs(start, peak_solar, export_rate):
+    """One day of half-hourly prices, solar and load (no randomness)"""
+    import_prices, export_prices, solar_forecast, load_forecast = [], [], [], []
+
+    for i in range(48):
+        time = start + timedelta(minutes=30 * i)
+        hour = time.hour + time.minute / 60
+        price = 2.0 if 0 <= hour < 5 else 38.0 if 16 <= hour < 19 else 18.0 + 6.0 * math.sin(hour / 3)
+        solar_kw = max(0.0, peak_solar * (1 - abs(hour - 13) / 6))
+        load_kw = 0.4 + 0.8 * (7 <= hour < 9) + 1.5 * (17 <= hour < 21)
+
+        import_prices.append({'time': time, 'price': round(price, 2), 'is_predicted': False})
+        export_prices.append({'time': time, 'price': export_rate})
+        solar_forecast.append({'time': time, 'kw': solar_kw})
+        load_forecast.append({'time': time, 'load_kw': load_kw, 'confidence': 'medium'})
+
+    return import_prices, export_prices, solar_forecast, load_forecast
+
+
+def run_planner(start, peak_solar, soc, capacity, rate, export_rate):
+    """Plan one scenario on a fresh planner, without the planner's log output"""
+    system_state = {
+        'current_state': {'battery_soc': soc},
+        'capabilities': {'battery_capacity': capacity, 'max_charge_rate': rate, 'max_discharge_rate': rate},
+    }
+    planner = LinearProgrammingPlanner()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return planner.create_plan(*create_inputs(start, peak_solar, export_rate), system_state), planner
+
+
+def test_objective_matches_battery_side_formulation():
+    """Optimal cost is unchanged by modelling discharge on the AC side"""
+    for start, peak_solar, soc, capacity, rate, export_rate, expected in SCENARIOS:
+        plan, _ = run_planner(start, peak_solar, soc, capacity, rate, export_rate)
+        assert plan['metadata']['solver_status'] == 'Optimal', plan['metadata'].get('error')
+        assert abs(plan['metadata']['total_cost'] - expected) < 1e-3, \
+            f"{start}: objective £{plan['metadata']['total_cost']:.4f}, expected £{expected:.4f}"
+
+    print(f"✅ LP objective matches the battery-side formulation on {len(SCENARIOS)} scenarios")
+
+
+def test_discharge_reported_battery_side():
+    """Slots report battery-side discharge, and AC power still balances"""
+    start, peak_solar, soc, capacity, rate, export_rate, _ = SCENARIOS[2]
+    plan, planner = run_planner(start, peak_solar, soc, capacity, rate, export_rate)
+    efficiency = planner.discharge_efficiency
+
+    assert any(slot['discharge_kw'] > rate - 1e-6 for slot in plan['slots']), \
+        "scenario should discharge at the full rate somewhere"
+
+    for slot in plan['slots']:
+        assert slot['discharge_kw'] <= rate + 1e-6, f"{slot['time']}: discharge over the rate limit"
+
+        # Energy in (solar, import, discharge after losses) = energy out
+        # (load, charge, export); no clipping in these scenarios
+        balance = (slot['solar_kw'] + slot['import_kw'] + slot['discharge_kw'] * efficiency
+                   - slot['load_kw'] - slot['charge_kw'] - slot['export_kw'])
+        assert abs(balance) < 1e-4, f"{slot['time']}: AC balance off by {balance:.5f}kW"
+
+    print("✅ Discharge reported battery-side and AC power balances")
+
+
+def test_constant_starting_soc():
+    """The known starting SOC is used as-is, even above max SOC"""
+    start, peak_solar, _, capacity, rate, export_rate, _ = SCENARIOS[0]
+
+    # (starting SOC %, objective £ from the pinned-variable formulation)
+    for soc, expected in ((97.0, -1.5174), (42.5, -1.4031)):
+        plan, _ = run_planner(start, peak_solar, soc, capacity, rate, export_rate)
+        assert plan['metadata']['solver_status'] == 'Optimal', plan['metadata'].get('error')
+        assert abs(plan['metadata']['total_cost'] - expected) < 1e-3, \
+            f"SOC {soc}%: objective £{plan['metadata']['total_cost']:.4f}, expected £{expected:.4f}"
+
+        first = plan['slots'][0]
+        assert first['soc_start'] == soc, f"first slot starts at {first['soc_start']}%, not {soc}%"
+        assert first['soc_end'] <= 95.0 + 1e-6, f"first slot ends above max SOC ({first['soc_end']:.2f}%)"
+
+    print("✅ Starting SOC substituted as a constant")
+
+
+if __name__ == '__main__':
+    test_objective_matches_battery_side_formulation()
+    test_discharge_reported_battery_side()
+    test_constant_starting_soc()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Regression test: re-using one LP planner across plans.
+
+The app keeps a single planner instance, so every plan after the first is
+warm-started from the previous solution. The seeded values must respect the
+new problem's bounds (e.g. the discharge bound of max_discharge_rate *
+discharge_efficiency), otherwise the second create_plan() fails.
+"""
+
+import sys
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apps.solar_optimizer.planners import LinearProgrammingPlanner
+
+
+def create_inputs(start, seed):
+    """One day of half-hourly prices, solar and load with a little noise"""
+    rng = random.Random(seed)
+    import_prices, export_prices, solar_forecast, load_forecast = [], [], [], []
+
+    for i in range(48):
+        time = start + timedelta(minutes=30 * i)
+        hour = time.hour
+        price = 5.0 if 2 <= hour < 5 else 35.0 if 16 <= hour < 19 else 20.0
+        solar_kw = max(0.0, 6.0 * (1 - abs(hour - 12) / 6.0)) if 6 <= hour < 18 else 0.0
+
+        # A high evening export price makes the solver discharge at full rate,
+        # i.e. right on the discharge variables' upper bound
+        export_price = 60.0 if 16 <= hour < 19 else 15.0
+
+        import_prices.append({'time': time, 'price': price + rng.uniform(-1, 1), 'is_predicted': False})
+        export_prices.append({'time': time, 'price': export_price})
+        solar_forecast.append({'time': time, 'kw': solar_kw * rng.uniform(0.9, 1.1)})
+        load_forecast.append({'time': time, 'load_kw': 0.5 + rng.uniform(0, 0.3), 'confidence': 'medium'})
+
+    return import_prices, export_prices, solar_forecast, load_forecast
+
+
+def test_reused_planner_warm_start():
+    """A second plan on the same instance, half an hour on, still solves"""
+    planner = LinearProgrammingPlanner()
+    start = datetime(2026, 1, 1)
+    system_state = {
+        'current_state': {'battery_soc': 90.0},
+        'capabilities': {'battery_capacity': 10.0, 'max_charge_rate': 3.0, 'max_discharge_rate': 3.0},
+    }
+
+    for run in range(4):
+        # Roll the horizon on a slot each time so most slots overlap
+        inputs = create_inputs(start + timedelta(minutes=30 * run), seed=run)
+        system_state['current_state']['battery_soc'] = 90.0 - run
+        plan = planner.create_plan(*inputs, system_state)
+        assert plan['slots'], f"plan {run + 1} returned no slots"
+
+    print("✅ Re-used LP planner produced 4 consecutive plans")
+
+
+if __name__ == '__main__':
+    test_reused_planner_warm_start()